@@ -12,6 +12,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.database import init_db
 from src.utils.auth import check_auth, init_session_state, create_default_admin
+from src.services.grading_queue import start_grading_worker
+from src.services.sheet_pool import start_sheet_pool_worker
+from src.services.deadline_sweeper import start_deadline_sweeper
+from src.services.autosave import start_autosave_flusher
 import pages.admin_dashboard as admin_dashboard
 import pages.admin_assessments as admin_assessments
 import pages.create_assessment as create_assessment
@@ -73,11 +77,29 @@ hide_sidebar_css = """
 """
 st.markdown(hide_sidebar_css, unsafe_allow_html=True)
 
-# Initialize database
-init_db()
+@st.cache_resource(show_spinner=False)
+def bootstrap():
+    """Run schema migrations and seed data once per process, not on every rerun"""
+    # Initialize database
+    init_db()
+    
+    # Create default admin if needed
+    create_default_admin()
+    
+    # Grade submitted assessments in the background
+    start_grading_worker()
+    
+    # Keep pre-copied template sheets ready for candidates
+    start_sheet_pool_worker()
+    
+    # Submit sessions whose time ran out, whether or not the candidate is still on the page
+    start_deadline_sweeper()
+    
+    # Write buffered MCQ answers in batches
+    start_autosave_flusher()
+    return True
 
-# Create default admin if needed
-create_default_admin()
+bootstrap()
 
 # Initialize session state
 init_session_state()
@@ -0,0 +1,95 @@
+"""
+Benchmark session grading with sequential vs concurrent sheet fetches
+
+Grades one submitted session against the in-process fake Sheets/Drive
+backend (src/services/fake_google.py) with --latency seconds per call and
+an optional --error-rate of injected 503s, so the numbers reflect how well
+grading overlaps network waits rather than Google's quota. The client-side
+rate limiter and snapshot cache are disabled.
+
+Usage:
+    python benchmarks/grading_concurrency.py --questions 20 --latency 0.5 --workers 1 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the app directory to path and keep the benchmark away from the real database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench_grading.db')
+os.environ['GOOGLE_API_RATE'] = '0'
+os.environ['SHEET_CACHE_MAX_BYTES'] = '0'
+
+from src.database import init_db, SessionLocal, Recruiter, Assessment, Question, Session, Response
+from src.services.fake_google import FakeGoogleBackend
+from src.services.google_sheets import GoogleSheetsAPI
+from src.services.grading import GradingEngine
+
+# Candidate sheet contents: a correct formula answer
+CANDIDATE_CELLS = {'Sheet1': {
+    'A1': 1,
+    'B2': {'formula': '=SUM(A1:A10)', 'value': 55},
+    'C2': 55,
+}}
+
+def seed(backend, questions):
+    """Create one session with a response (and its own sheet) per question"""
+    init_db()
+    db = SessionLocal()
+    try:
+        recruiter = Recruiter(email='bench@example.com', password_hash='x', name='Bench', dashboard_slug='bench')
+        db.add(recruiter)
+        db.flush()
+        assessment = Assessment(recruiter_id=recruiter.id, title='Benchmark')
+        db.add(assessment)
+        db.flush()
+        session = Session(assessment_id=assessment.id, candidate_name='C', candidate_email='c@example.com', unique_token='bench')
+        db.add(session)
+        db.flush()
+        for idx in range(questions):
+            question = Question(
+                assessment_id=assessment.id,
+                type='formula',
+                question_text=f"Q{idx}",
+                answer_key={'formulas': {'B2': '=SUM(A1:A10)'}, 'values': {'C2': 55}},
+                display_order=idx
+            )
+            db.add(question)
+            db.flush()
+            sheet_id = backend.add_spreadsheet(f"Q{idx}", CANDIDATE_CELLS)
+            db.add(Response(session_id=session.id, question_id=question.id,
+                            sheet_url=f"https://docs.google.com/spreadsheets/d/{sheet_id}"))
+        db.commit()
+        return session.id
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    
+    backend = FakeGoogleBackend(latency=args.latency, error_rate=args.error_rate, seed=1)
+    session_id = seed(backend, args.questions)
+    db = SessionLocal()
+    try:
+        responses = db.query(Response).filter(Response.session_id == session_id).all()
+        print(f"{'workers':>8}{'seconds':>10}{'graded':>8}{'errors':>8}")
+        for workers in args.workers:
+            engine = GradingEngine(google_sheets=GoogleSheetsAPI(backend=backend), max_workers=workers)
+            start = time.perf_counter()
+            results = engine.grade_session(db, responses)
+            elapsed = time.perf_counter() - start
+            errors = sum(1 for result in results.values() if result.get('error'))
+            print(f"{workers:>8}{elapsed:>10.2f}{len(results):>8}{errors:>8}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
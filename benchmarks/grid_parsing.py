@@ -0,0 +1,113 @@
+"""
+Microbenchmark grid parsing of a spreadsheets().get response
+
+Builds a synthetic --rows x --columns grid (numbers, strings and formulas
+with computed values, some blanks) and times GoogleSheetsAPI._parse_grid
+against the previous per-cell implementation, which converted every
+(row, column) pair to a reference with chr() arithmetic. Both must produce
+identical output.
+
+Usage:
+    python benchmarks/grid_parsing.py --rows 1000 --columns 52 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.google_sheets import GoogleSheetsAPI
+
+def build_response(rows, columns):
+    """One tab of GridData; every 7th cell is blank"""
+    row_data = []
+    for row in range(rows):
+        values = []
+        for col in range(columns):
+            kind = (row * columns + col) % 7
+            if kind == 0:
+                values.append({})
+            elif kind in (1, 2, 3):
+                values.append({'userEnteredValue': {'numberValue': row * col}, 'effectiveValue': {'numberValue': row * col}})
+            elif kind in (4, 5):
+                values.append({'userEnteredValue': {'stringValue': f"r{row}c{col}"}, 'effectiveValue': {'stringValue': f"r{row}c{col}"}})
+            else:
+                values.append({'userEnteredValue': {'formulaValue': f"=A{row + 1}*2"}, 'effectiveValue': {'numberValue': row * 2}})
+        row_data.append({'values': values})
+    return {'sheets': [{'properties': {'title': 'Sheet1'}, 'data': [{'rowData': row_data}]}]}
+
+def legacy_parse(result):
+    """Grid parser as of the range-restricted fetch change, kept for comparison"""
+    def cell_reference(row, col):
+        col_letter = chr(65 + col % 26)
+        if col >= 26:
+            col_letter = chr(64 + col // 26) + col_letter
+        return f"{col_letter}{row + 1}"
+    
+    def parse_cell(cell_data):
+        entered_value = cell_data.get('userEnteredValue')
+        if not entered_value:
+            return None
+        if 'formulaValue' in entered_value:
+            cell = {'type': 'formula', 'value': entered_value['formulaValue']}
+        elif 'numberValue' in entered_value:
+            cell = {'type': 'number', 'value': entered_value['numberValue']}
+        elif 'stringValue' in entered_value:
+            cell = {'type': 'string', 'value': entered_value['stringValue']}
+        else:
+            return None
+        effective_value = cell_data.get('effectiveValue') or {}
+        for key in ('numberValue', 'stringValue', 'boolValue'):
+            if key in effective_value:
+                cell['effective_value'] = effective_value[key]
+                break
+        return cell
+    
+    sheet_data = {}
+    for sheet in result.get('sheets', []):
+        cells = sheet_data.setdefault(sheet['properties']['title'], {})
+        for grid in sheet.get('data', []):
+            start_row = grid.get('startRow', 0)
+            start_column = grid.get('startColumn', 0)
+            for row_offset, row_data in enumerate(grid.get('rowData', [])):
+                for column_offset, cell_data in enumerate(row_data.get('values', [])):
+                    cell = parse_cell(cell_data)
+                    if cell:
+                        cells[cell_reference(start_row + row_offset, start_column + column_offset)] = cell
+    return sheet_data
+
+def best_of(repeat, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--columns', type=int, default=52)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    # The legacy parser only produced correct labels up to column ZZ
+    response = build_response(args.rows, args.columns)
+    api = GoogleSheetsAPI()
+    parsed = api._parse_grid(response)
+    if args.columns <= 702:
+        assert parsed == legacy_parse(response), "parsers disagree"
+    
+    cells = args.rows * args.columns
+    legacy = best_of(args.repeat, legacy_parse, response)
+    current = best_of(args.repeat, api._parse_grid, response)
+    print(f"grid {args.rows}x{args.columns} ({cells} cells, {len(parsed['Sheet1'])} non-empty)")
+    print(f"{'parser':>10}{'ms':>10}{'ns/cell':>10}")
+    print(f"{'legacy':>10}{legacy * 1000:>10.1f}{legacy / cells * 1e9:>10.0f}")
+    print(f"{'current':>10}{current * 1000:>10.1f}{current / cells * 1e9:>10.0f}")
+    print(f"speedup: {legacy / current:.2f}x")
+
+if __name__ == "__main__":
+    main()
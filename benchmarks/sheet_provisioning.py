@@ -0,0 +1,113 @@
+"""
+Benchmark getting a candidate their sheet copies
+
+Compares, against the in-process fake Sheets/Drive backend with --latency
+seconds per round trip (--copy-latency for Drive file copies):
+  sequential  one copy_sheet() per question, as the "Create Your Copy" buttons do
+  at-start    provision_session_sheets() with an empty warm pool
+  warm-pool   provision_session_sheets() with every template pre-copied
+
+Usage:
+    python benchmarks/sheet_provisioning.py --questions 10 --latency 0.3 --copy-latency 1.5 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the app directory to path and keep the benchmark away from the real database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench_provisioning.db')
+os.environ['GOOGLE_API_RATE'] = '0'
+os.environ['SHEET_CACHE_MAX_BYTES'] = '0'
+
+from src.database import init_db, SessionLocal, Recruiter, Assessment, Question, Session, Response
+from src.services.fake_google import FakeGoogleBackend
+from src.services.google_sheets import GoogleSheetsAPI
+from src.services import sheet_pool
+
+def seed(backend, questions):
+    """One assessment with a formula question (and its own template) per question"""
+    init_db()
+    db = SessionLocal()
+    try:
+        recruiter = Recruiter(email='bench@example.com', password_hash='x', name='Bench', dashboard_slug='bench')
+        db.add(recruiter)
+        db.flush()
+        assessment = Assessment(recruiter_id=recruiter.id, title='Benchmark')
+        db.add(assessment)
+        db.flush()
+        for idx in range(questions):
+            template_id = backend.add_spreadsheet(f"Template {idx}", {'Sheet1': {'A1': idx}})
+            db.add(Question(
+                assessment_id=assessment.id,
+                type='formula',
+                question_text=f"Q{idx}",
+                sheet_template_url=f"https://docs.google.com/spreadsheets/d/{template_id}",
+                display_order=idx
+            ))
+        db.commit()
+        return assessment.id
+    finally:
+        db.close()
+
+def new_session(db, assessment_id, label):
+    session = Session(assessment_id=assessment_id, candidate_name=label,
+                      candidate_email=f"{label}@example.com", unique_token=label, status='in_progress')
+    db.add(session)
+    db.commit()
+    return session
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--copy-latency', type=float, default=1.5)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    
+    backend = FakeGoogleBackend(latency=args.latency, seed=1,
+                                method_latency={'drive.files.copy': args.copy_latency})
+    google_sheets = GoogleSheetsAPI(backend=backend)
+    assessment_id = seed(backend, args.questions)
+    sheet_pool.PROVISION_MAX_WORKERS = args.workers
+    
+    db = SessionLocal()
+    try:
+        assessment = db.get(Assessment, assessment_id)
+        questions = db.query(Question).filter(Question.assessment_id == assessment_id).order_by(Question.display_order).all()
+        print(f"{'strategy':>12}{'seconds':>10}{'sheets':>8}{'calls':>8}")
+        
+        def report(label, run):
+            calls_before = backend.calls
+            session = new_session(db, assessment_id, label)
+            start = time.perf_counter()
+            run(session)
+            db.commit()
+            elapsed = time.perf_counter() - start
+            sheets = db.query(Response).filter(Response.session_id == session.id).count()
+            print(f"{label:>12}{elapsed:>10.2f}{sheets:>8}{backend.calls - calls_before:>8}")
+        
+        def sequential(session):
+            for idx, question in enumerate(questions):
+                template_id = google_sheets.extract_sheet_id(question.sheet_template_url)
+                result = google_sheets.copy_sheet(template_id, f"Q{idx + 1}", session.candidate_email)
+                db.add(Response(session_id=session.id, question_id=question.id, sheet_url=result['url']))
+        
+        # Pool disabled: every question is copied from its template
+        sheet_pool.SHEET_POOL_SIZE = 0
+        report('sequential', sequential)
+        report('at-start', lambda session: sheet_pool.provision_session_sheets(db, google_sheets, session, assessment, questions))
+        
+        # Fill the pool outside the timed section, as the background worker would
+        sheet_pool.SHEET_POOL_SIZE = 1
+        for question in questions:
+            sheet_pool.replenish_template(db, google_sheets, google_sheets.extract_sheet_id(question.sheet_template_url))
+        report('warm-pool', lambda session: sheet_pool.provision_session_sheets(db, google_sheets, session, assessment, questions))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark concurrent read/write throughput for the SQLite engine profiles
+
+Simulates recruiters loading dashboards (readers) while candidates save
+answers (writers) against a throwaway database for each profile.
+
+Usage:
+    python benchmarks/sqlite_engine_profiles.py --seconds 5 --readers 8 --writers 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Add the app directory to path and keep the benchmark away from the real database
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_PATH', os.path.join(tempfile.mkdtemp(), 'bootstrap.db'))
+
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, ENGINE_PROFILES, create_db_engine, Recruiter, Assessment, Question, Session, Response
+
+def seed(engine, assessments=20, questions=10, sessions=50):
+    """Populate a fresh database with a realistic amount of data"""
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        recruiter = Recruiter(email='bench@example.com', password_hash='x', name='Bench', dashboard_slug='bench')
+        db.add(recruiter)
+        db.flush()
+        for a in range(assessments):
+            assessment = Assessment(recruiter_id=recruiter.id, title=f"Assessment {a}")
+            db.add(assessment)
+            db.flush()
+            question_ids = []
+            for q in range(questions):
+                question = Question(assessment_id=assessment.id, question_text=f"Q{q}", display_order=q)
+                db.add(question)
+                db.flush()
+                question_ids.append(question.id)
+            for s in range(sessions):
+                session = Session(
+                    assessment_id=assessment.id,
+                    candidate_name=f"Candidate {s}",
+                    candidate_email=f"c{a}-{s}@example.com",
+                    unique_token=f"tok-{a}-{s}",
+                    started_at=datetime.utcnow() - timedelta(minutes=5),
+                    status=random.choice(['in_progress', 'completed'])
+                )
+                db.add(session)
+                db.flush()
+                for question_id in question_ids:
+                    db.add(Response(session_id=session.id, question_id=question_id, sheet_url='A'))
+        db.commit()
+        return recruiter.id
+    finally:
+        db.close()
+
+def run_profile(profile, args):
+    """Run readers and writers concurrently and return ops/sec figures"""
+    db_path = os.path.join(tempfile.mkdtemp(), f'bench_{profile}.db')
+    engine = create_db_engine(db_path, profile)
+    recruiter_id = seed(engine)
+    SessionFactory = sessionmaker(bind=engine)
+    
+    with engine.connect() as conn:
+        max_response_id = conn.exec_driver_sql("SELECT MAX(id) FROM responses").scalar()
+    
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    
+    def reader():
+        while not stop.is_set():
+            db = SessionFactory()
+            try:
+                db.query(func.count(Session.id)).join(Assessment).filter(
+                    Assessment.recruiter_id == recruiter_id,
+                    Session.status == 'completed'
+                ).scalar()
+                db.query(func.count(Response.id)).filter(Response.manual_score.is_(None)).scalar()
+                key = 'reads'
+            except Exception:
+                key = 'errors'
+            finally:
+                db.close()
+            with lock:
+                counts[key] += 1
+    
+    def writer():
+        rng = random.Random()
+        while not stop.is_set():
+            db = SessionFactory()
+            try:
+                response = db.get(Response, rng.randint(1, max_response_id))
+                response.sheet_url = rng.choice('ABCD')
+                db.commit()
+                key = 'writes'
+            except Exception:
+                db.rollback()
+                key = 'errors'
+            finally:
+                db.close()
+            with lock:
+                counts[key] += 1
+    
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    
+    return {
+        'profile': profile,
+        'reads_per_sec': counts['reads'] / elapsed,
+        'writes_per_sec': counts['writes'] / elapsed,
+        'errors': counts['errors'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--profiles', nargs='+', default=list(ENGINE_PROFILES))
+    args = parser.parse_args()
+    
+    print(f"{'profile':<12}{'reads/s':>12}{'writes/s':>12}{'errors':>10}")
+    for profile in args.profiles:
+        result = run_profile(profile, args)
+        print(f"{result['profile']:<12}{result['reads_per_sec']:>12.1f}{result['writes_per_sec']:>12.1f}{result['errors']:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,11 @@ import json
 import uuid
 import re
 from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
 from src.database import SessionLocal, Assessment, Question, Invitation, Recruiter
 from src.utils.auth import check_auth
 from src.services.google_sheets import get_google_sheets_service
+from src.services.sheet_pool import provisioning_enabled
 
 def extract_sheet_id(sheet_url_or_id):
     """
@@ -72,7 +74,10 @@ def list_assessments(db, user_id):
             st.session_state.page = 'create_assessment'
             st.rerun()
     
-    assessments = db.query(Assessment).filter(Assessment.recruiter_id == user_id).order_by(Assessment.created_at.desc()).all()
+    # Counters are loaded in the same query instead of two COUNTs per assessment
+    assessments = db.query(Assessment).options(joinedload(Assessment.counters)).filter(
+        Assessment.recruiter_id == user_id
+    ).order_by(Assessment.created_at.desc()).all()
     
     if not assessments:
         st.info("No assessments yet. Create your first assessment!")
@@ -92,13 +97,12 @@ def list_assessments(db, user_id):
                 st.write(f"⏱️ Duration: {assessment.duration_minutes} minutes")
                 st.write(f"📅 Created: {assessment.created_at.strftime('%Y-%m-%d')}")
             
+            counters = assessment.counters
             with col2:
-                questions_count = db.query(Question).filter(Question.assessment_id == assessment.id).count()
-                st.metric("Questions", questions_count)
+                st.metric("Questions", counters.question_count if counters else 0)
             
             with col3:
-                sessions_count = db.query(Session).filter(Session.assessment_id == assessment.id).count()
-                st.metric("Sessions", sessions_count)
+                st.metric("Sessions", counters.session_count if counters else 0)
             
             col_a, col_b, col_c, col_d = st.columns(4)
             with col_a:
@@ -468,6 +472,11 @@ def edit_assessment(db, user_id, assessment_id):
         title = st.text_input("Assessment Title *", value=assessment.title)
         description = st.text_area("Description", value=assessment.description or "")
         duration_minutes = st.number_input("Duration (minutes) *", min_value=1, value=assessment.duration_minutes)
+        provision_at_start = st.checkbox(
+            "Create all candidate sheets when the assessment starts",
+            value=provisioning_enabled(assessment),
+            help="Copies every question's template as soon as the candidate starts, instead of on each question's button"
+        )
         
         submitted = st.form_submit_button("Save Changes", use_container_width=True)
         
@@ -475,6 +484,8 @@ def edit_assessment(db, user_id, assessment_id):
             assessment.title = title
             assessment.description = description
             assessment.duration_minutes = duration_minutes
+            # Reassign so SQLAlchemy sees the JSON column change
+            assessment.settings = {**(assessment.settings or {}), 'provision_sheets_at_start': provision_at_start}
             assessment.updated_at = datetime.utcnow()
             
             db.commit()
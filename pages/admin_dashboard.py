@@ -2,7 +2,8 @@
 
 import streamlit as st
 from datetime import datetime, timedelta
-from src.database import SessionLocal, Assessment, Session, Question, Invitation, Response
+from src.database import SessionLocal
+from src.services.stats import get_dashboard_stats
 
 def render():
     # Get user info
@@ -17,32 +18,13 @@ def render():
     try:
         user_id = st.session_state.user['id']
         
-        # Get statistics
-        total_assessments = db.query(Assessment).filter(Assessment.recruiter_id == user_id).count()
-        
-        # Total candidates (invitations sent)
-        total_candidates = db.query(Invitation).join(Assessment).filter(
-            Assessment.recruiter_id == user_id
-        ).count()
-        
-        # In progress sessions
-        in_progress = db.query(Session).join(Assessment).filter(
-            Assessment.recruiter_id == user_id,
-            Session.status == 'in_progress'
-        ).count()
-        
-        # Completed sessions
-        completed = db.query(Session).join(Assessment).filter(
-            Assessment.recruiter_id == user_id,
-            Session.status == 'completed'
-        ).count()
-        
-        # Pending reviews (sessions with responses that need manual review)
-        pending_reviews = db.query(Response).join(Session).join(Assessment).filter(
-            Assessment.recruiter_id == user_id,
-            Response.auto_score.isnot(None),
-            Response.manual_score.is_(None)
-        ).count()
+        # Get statistics (all tiles and the recent assessments table)
+        stats = get_dashboard_stats(db, user_id)
+        total_assessments = stats.total_assessments
+        total_candidates = stats.total_candidates
+        in_progress = stats.in_progress
+        completed = stats.completed
+        pending_reviews = stats.pending_reviews
         
         # Create Assessment button (top right)
         st.markdown("<br>", unsafe_allow_html=True)
@@ -101,37 +83,19 @@ def render():
         # Recent Assessments section
         st.markdown("### Recent Assessments")
         
-        # Get recent assessments
-        recent_assessments = db.query(Assessment).filter(
-            Assessment.recruiter_id == user_id
-        ).order_by(Assessment.created_at.desc()).limit(10).all()
+        recent_assessments = stats.recent_assessments
         
         if recent_assessments:
             # Create table data
             table_data = []
             for assessment in recent_assessments:
-                # Get question count
-                question_count = db.query(Question).filter(Question.assessment_id == assessment.id).count()
-                
-                # Get candidate count
-                candidate_count = db.query(Invitation).filter(Invitation.assessment_id == assessment.id).count()
-                
-                # Get completed count
-                completed_count = db.query(Session).filter(
-                    Session.assessment_id == assessment.id,
-                    Session.status == 'completed'
-                ).count()
-                
-                # Get status (simplified - can be enhanced)
-                status = "Draft" if question_count == 0 else "Active"
-                
                 table_data.append({
                     "Title": assessment.title,
                     "Subtitle": assessment.description[:50] + "..." if assessment.description and len(assessment.description) > 50 else (assessment.description or "Assessment created via form"),
-                    "Status": status,
-                    "Questions": question_count,
-                    "Candidates": candidate_count,
-                    "Completed": completed_count,
+                    "Status": assessment.status,
+                    "Questions": assessment.question_count,
+                    "Candidates": assessment.candidate_count,
+                    "Completed": assessment.completed_count,
                     "Created": assessment.created_at.strftime('%b %d, %Y') if assessment.created_at else "N/A",
                     "Assessment ID": assessment.id
                 })
@@ -3,7 +3,7 @@
 import streamlit as st
 from datetime import datetime
 from src.database import SessionLocal, Recruiter, Assessment, Session
-from sqlalchemy import func, desc
+from src.services.stats import get_system_stats, search_recruiters, get_recruiter_overview
 import pandas as pd
 
 def render():
@@ -21,25 +21,19 @@ def render():
     
     db = SessionLocal()
     try:
-        # Get all recruiters
-        recruiters = db.query(Recruiter).order_by(desc(Recruiter.created_at)).all()
-        
         # Get system statistics
-        total_recruiters = len(recruiters)
-        active_recruiters = len([r for r in recruiters if r.status == 'active'])
-        total_assessments = db.query(Assessment).count()
-        total_sessions = db.query(Session).count()
+        system_stats = get_system_stats(db)
         
         # Display metrics
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Recruiters", total_recruiters)
+            st.metric("Total Recruiters", system_stats.total_users)
         with col2:
-            st.metric("Active Recruiters", active_recruiters)
+            st.metric("Active Recruiters", system_stats.active_users)
         with col3:
-            st.metric("Total Assessments", total_assessments)
+            st.metric("Total Assessments", system_stats.total_assessments)
         with col4:
-            st.metric("Total Sessions", total_sessions)
+            st.metric("Total Sessions", system_stats.total_sessions)
         
         st.markdown("---")
         
@@ -47,12 +41,15 @@ def render():
         tab1, tab2 = st.tabs(["👥 User Management", "📊 System Overview"])
         
         with tab1:
-            render_user_management(db, recruiters)
+            render_user_management(db, system_stats)
         
         with tab2:
-            render_system_overview(db, recruiters, total_assessments, total_sessions)
+            render_system_overview(db)
     
-def render_user_management(db, recruiters):
+    finally:
+        db.close()
+
+def render_user_management(db, system_stats):
     """Render user management section with all features"""
     st.subheader("👥 User Management")
     st.markdown("Manage all users logged in through admin login page")
@@ -70,50 +67,40 @@ def render_user_management(db, recruiters):
         return
     
     # User statistics
-    if recruiters:
-        active_count = len([r for r in recruiters if r.status == 'active'])
-        admin_count = len([r for r in recruiters if r.is_admin])
-        recruiter_count = len([r for r in recruiters if not r.is_admin])
-        
+    if system_stats.total_users:
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Users", len(recruiters))
+            st.metric("Total Users", system_stats.total_users)
         with col2:
-            st.metric("Active Users", active_count)
+            st.metric("Active Users", system_stats.active_users)
         with col3:
-            st.metric("Admins", admin_count)
+            st.metric("Admins", system_stats.admin_users)
         with col4:
-            st.metric("Recruiters", recruiter_count)
+            st.metric("Recruiters", system_stats.recruiter_users)
         
         st.markdown("---")
         
-        # Search and filter
-        col1, col2, col3 = st.columns([2, 1, 1])
+        # Search, filter and sort (applied in SQL)
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
         with col1:
             search_term = st.text_input("🔍 Search users", placeholder="Search by name, email, or company...")
         with col2:
             status_filter = st.selectbox("Status", ["All", "Active", "Inactive"], index=0)
         with col3:
             role_filter = st.selectbox("Role", ["All", "Admin", "Recruiter"], index=0)
-        
-        # Filter recruiters
-        filtered_recruiters = recruiters
-        if search_term:
-            search_lower = search_term.lower()
-            filtered_recruiters = [r for r in filtered_recruiters if 
-                                 search_lower in r.name.lower() or 
-                                 search_lower in r.email.lower() or 
-                                 (r.company and search_lower in r.company.lower())]
-        
-        if status_filter != "All":
-            filtered_recruiters = [r for r in filtered_recruiters if 
-                                 r.status == status_filter.lower()]
-        
-        if role_filter != "All":
-            is_admin_filter = role_filter == "Admin"
-            filtered_recruiters = [r for r in filtered_recruiters if r.is_admin == is_admin_filter]
-        
-        st.markdown(f"**Showing {len(filtered_recruiters)} of {len(recruiters)} users**")
+        with col4:
+            sort_labels = {"Newest": 'newest', "Oldest": 'oldest', "Name": 'name', "Last Login": 'last_login'}
+            sort_label = st.selectbox("Sort by", list(sort_labels), index=0)
+        
+        filtered_recruiters = search_recruiters(
+            db,
+            search=search_term.strip(),
+            status=status_filter.lower() if status_filter != "All" else None,
+            is_admin=(role_filter == "Admin") if role_filter != "All" else None,
+            sort=sort_labels[sort_label]
+        ).all()
+        
+        st.markdown(f"**Showing {len(filtered_recruiters)} of {system_stats.total_users} users**")
         st.markdown("---")
         
         # Users table with enhanced display
@@ -229,35 +216,26 @@ def render_user_management(db, recruiters):
         show_delete_recruiter_confirmation(st.session_state.delete_recruiter_id)
         return
 
-def render_system_overview(db, recruiters, total_assessments, total_sessions):
+def render_system_overview(db):
     """Render system overview section"""
     st.subheader("📊 System Overview")
     
-    # Get all recruiters for display
-    recruiter_data = []
-    for recruiter in recruiters:
-        recruiter_assessments = db.query(Assessment).filter(Assessment.recruiter_id == recruiter.id).count()
-        recruiter_sessions = db.query(Session).join(Assessment).filter(Assessment.recruiter_id == recruiter.id).count()
-        
-        recruiter_data.append({
-            'ID': recruiter.id,
-            'Name': recruiter.name,
-            'Email': recruiter.email,
-            'Company': recruiter.company,
-            'Dashboard Slug': recruiter.dashboard_slug,
-            'Status': recruiter.status,
-            'Assessments': recruiter_assessments,
-            'Sessions': recruiter_sessions,
-            'Created': recruiter.created_at.strftime('%Y/%m/%d') if recruiter.created_at else 'N/A',
-            'Last Login': recruiter.last_login.strftime('%Y/%m/%d %H:%M') if recruiter.last_login else 'Never',
-            'Admin': 'Yes' if recruiter.is_admin else 'No'
-        })
+    # One grouped query for every recruiter with assessment/session counts
+    rows = get_recruiter_overview(db)
+    
+    recruiter_data = pd.DataFrame.from_records(rows, columns=[
+        'ID', 'Name', 'Email', 'Company', 'Dashboard Slug', 'Status',
+        'Assessments', 'Sessions', 'Created', 'Last Login', 'Admin'
+    ])
+    if not recruiter_data.empty:
+        recruiter_data['Created'] = pd.to_datetime(recruiter_data['Created']).dt.strftime('%Y/%m/%d').fillna('N/A')
+        recruiter_data['Last Login'] = pd.to_datetime(recruiter_data['Last Login']).dt.strftime('%Y/%m/%d %H:%M').fillna('Never')
+        recruiter_data['Admin'] = recruiter_data['Admin'].map(lambda is_admin: 'Yes' if is_admin else 'No')
     
     # Display table
-    if recruiter_data:
-        df = pd.DataFrame(recruiter_data)
+    if not recruiter_data.empty:
         st.dataframe(
-            df,
+            recruiter_data,
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -288,9 +266,6 @@ def render_system_overview(db, recruiters, total_assessments, total_sessions):
         if st.session_state.get('show_add_recruiter', False):
             show_add_recruiter_form()
             return
-        
-    finally:
-        db.close()
 
 def show_user_credentials(recruiter_id):
     """Show and manage user credentials"""
@@ -2,8 +2,46 @@
 
 import streamlit as st
 from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
 from src.database import SessionLocal, Session, Assessment, Question, Response
-from src.services.grading import GradingEngine
+from src.services.grading import GradingEngine, question_to_dict
+
+# Sessions shown per page; pages are addressed by keyset cursors, not offsets
+PAGE_SIZE = 20
+
+def fetch_sessions_page(db, user_id, assessment_filter=None, cursor=None, page_size=PAGE_SIZE):
+    """Fetch one page of (session, assessment title) rows, newest first
+    
+    cursor is the (created_at, id) of the last row of the previous page.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    query = db.query(Session, Assessment.title).join(Assessment, Session.assessment_id == Assessment.id).filter(
+        Assessment.recruiter_id == user_id
+    )
+    
+    if assessment_filter:
+        query = query.filter(Session.assessment_id == assessment_filter)
+    
+    if cursor:
+        cursor_created_at, cursor_id = cursor
+        query = query.filter(or_(
+            Session.created_at < cursor_created_at,
+            and_(Session.created_at == cursor_created_at, Session.id < cursor_id)
+        ))
+    
+    # One extra row tells us whether another page exists
+    rows = query.order_by(Session.created_at.desc(), Session.id.desc()).limit(page_size + 1).all()
+    
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_session = rows[-1][0]
+        next_cursor = (last_session.created_at, last_session.id)
+    return rows, next_cursor
+
+# Stands in for "no filter stored yet", distinct from the None of an unfiltered list
+_UNSET = object()
 
 def render():
     st.title("👥 Sessions")
@@ -21,15 +59,20 @@ def render():
             if assessment:
                 st.subheader(f"Assessment: {assessment.title}")
         
-        # Get sessions
-        query = db.query(Session).join(Assessment).filter(Assessment.recruiter_id == user_id)
-        
-        if assessment_filter:
-            query = query.filter(Session.assessment_id == assessment_filter)
+        # Cursor stack: one entry per page visited, reset when the filter changes.
+        # The first visit has no stored filter, which must not match "no filter".
+        if ('sessions_cursors' not in st.session_state
+                or st.session_state.get('sessions_cursor_filter', _UNSET) != assessment_filter):
+            st.session_state.sessions_cursor_filter = assessment_filter
+            st.session_state.sessions_cursors = [None]
+            st.session_state.open_session_id = None
+        cursors = st.session_state.sessions_cursors
+        page_idx = len(cursors) - 1
         
-        sessions = query.order_by(Session.created_at.desc()).all()
+        # Get sessions
+        rows, next_cursor = fetch_sessions_page(db, user_id, assessment_filter, cursors[-1])
         
-        if not sessions:
+        if not rows:
             st.info("No sessions found.")
             if assessment_filter:
                 if st.button("← Back to All Sessions"):
@@ -38,13 +81,13 @@ def render():
             return
         
         # Sessions list
-        for session in sessions:
+        for session, assessment_title in rows:
             with st.container():
                 col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
                 
                 with col1:
                     st.subheader(f"👤 {session.candidate_name or session.candidate_email}")
-                    st.write(f"📝 Assessment: {session.assessment.title}")
+                    st.write(f"📝 Assessment: {assessment_title}")
                     if session.started_at:
                         st.caption(f"Started: {session.started_at.strftime('%Y-%m-%d %H:%M:%S')}")
                 
@@ -67,12 +110,33 @@ def render():
                     if session.suspicion_score > 0:
                         st.warning(f"⚠️ Suspicion: {session.suspicion_score}")
                 
-                # View details
-                with st.expander("View Details"):
-                    view_session_details(db, session)
+                # View details - only the opened session's responses are queried
+                is_open = st.session_state.get('open_session_id') == session.id
+                if st.button("Hide Details" if is_open else "View Details", key=f"details_{session.id}"):
+                    st.session_state.open_session_id = None if is_open else session.id
+                    st.rerun()
+                
+                if is_open:
+                    with st.container():
+                        view_session_details(db, session)
                 
                 st.divider()
         
+        # Pagination
+        prev_col, page_col, next_col = st.columns([1, 1, 1])
+        with prev_col:
+            if st.button("◀ Newer", disabled=page_idx == 0, key="sessions_prev"):
+                cursors.pop()
+                st.session_state.open_session_id = None
+                st.rerun()
+        with page_col:
+            st.write(f"Page {page_idx + 1}")
+        with next_col:
+            if st.button("Older ▶", disabled=next_cursor is None, key="sessions_next"):
+                cursors.append(next_cursor)
+                st.session_state.open_session_id = None
+                st.rerun()
+        
         if assessment_filter and st.button("← Back to All Sessions"):
             del st.session_state.filter_assessment_id
             st.rerun()
@@ -89,14 +153,16 @@ def view_session_details(db, session):
     if session.completed_at:
         st.write(f"**Completed:** {session.completed_at.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Responses
-    responses = db.query(Response).filter(Response.session_id == session.id).all()
+    # Responses with their questions in one query
+    responses = db.query(Response).options(joinedload(Response.question)).join(
+        Question, Response.question_id == Question.id
+    ).filter(Response.session_id == session.id).order_by(Question.display_order, Question.id).all()
     
     if responses:
         st.subheader("Responses")
         
         for response in responses:
-            question = db.query(Question).filter(Question.id == response.question_id).first()
+            question = response.question
             if question:
                 with st.expander(f"Question: {question.question_text[:50]}..."):
                     st.write(f"**Type:** {question.type}")
@@ -130,8 +196,7 @@ def view_session_details(db, session):
                             response.graded_at = datetime.utcnow()
                             
                             # Recalculate final score
-                            all_responses = db.query(Response).filter(Response.session_id == session.id).all()
-                            total_points = sum([r.manual_score if r.manual_score else (r.auto_score if r.auto_score else 0) for r in all_responses])
+                            total_points = sum([r.manual_score if r.manual_score else (r.auto_score if r.auto_score else 0) for r in responses])
                             session.final_score = total_points
                             
                             db.commit()
@@ -141,7 +206,7 @@ def view_session_details(db, session):
                     # Re-grade button
                     if response.sheet_url and st.button("🔄 Re-grade", key=f"regrade_{response.id}"):
                         grading_engine = GradingEngine()
-                        result = grading_engine.grade_response(question.__dict__, response.sheet_url)
+                        result = grading_engine.grade_response(question_to_dict(question), response.sheet_url)
                         
                         response.auto_score = result.get('auto_score', 0)
                         db.commit()
@@ -62,6 +62,10 @@ def render():
                     with open(credentials_path, 'w') as f:
                         json.dump(credentials_data, f, indent=2)
                     
+                    # Pick up the new file immediately, even if its mtime/size look unchanged
+                    from src.services.google_sheets import reload_google_credentials
+                    reload_google_credentials()
+                    
                     st.success("✅ Google Sheets credentials saved successfully!")
                     st.info(f"Credentials saved to: `{credentials_path}`")
                     
@@ -242,6 +246,34 @@ def render():
             st.text(f"Database Path: {os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'assessments.db')}")
             st.text(f"Database Size: {get_db_size()}")
             
+            # Sheet snapshot cache (counters are per process)
+            from src.services.google_sheets import snapshot_cache
+            cache_stats = snapshot_cache.stats()
+            st.markdown("**Sheet Snapshot Cache:**")
+            st.text(f"Hits: {cache_stats['hits']} / Misses: {cache_stats['misses']} ({cache_stats['hit_rate']:.0%} hit rate)")
+            st.text(f"Entries: {cache_stats['entries']} ({cache_stats['bytes'] / 1024:.1f} KB, {cache_stats['evictions']} evicted)")
+            if st.button("Clear Sheet Cache"):
+                snapshot_cache.clear()
+                st.success("Sheet cache cleared")
+            
+            # Google API calls made by this process
+            from src.services.google_sheets import api_metrics
+            method_metrics = api_metrics.snapshot()
+            if method_metrics:
+                st.markdown("**Google API Calls:**")
+                st.dataframe([
+                    {
+                        'Method': method,
+                        'Calls': entry['calls'],
+                        'Errors': entry['errors'],
+                        'Retries': entry['retries'],
+                        'Avg (s)': round(entry['avg_seconds'], 3),
+                        'Max (s)': round(entry['max_seconds'], 3),
+                        'Throttled (s)': round(entry['throttled_seconds'], 2)
+                    }
+                    for method, entry in sorted(method_metrics.items())
+                ], use_container_width=True)
+
             # Application info
             st.markdown("**Application Information:**")
             st.text(f"Version: 1.0.0")
@@ -3,8 +3,12 @@
 import streamlit as st
 import uuid
 from datetime import datetime, timedelta
-from src.database import SessionLocal, Invitation, Session, Assessment, Question, Response
+from src.components.countdown import render_countdown
+from src.database import SessionLocal, Invitation, Session, Response
+from src.services.assessment_cache import get_assessment_bundle
+from src.services.autosave import buffer_answer, pending_answer, flush_answers
 from src.services.google_sheets import get_google_sheets_service
+from src.services.token_cache import resolve_token, invalidate_token
 
 def render():
     query_params = st.query_params
@@ -16,34 +20,45 @@ def render():
     
     db = SessionLocal()
     try:
-        # Validate invitation
-        invitation = db.query(Invitation).filter(Invitation.unique_token == token).first()
+        # Validate invitation (cached; see src/services/token_cache.py)
+        resolved = resolve_token(db, token)
         
-        if not invitation:
+        if not resolved:
             st.error("Invalid or expired assessment link.")
             return
         
-        if invitation.expires_at < datetime.utcnow():
-            st.error("This assessment link has expired.")
+        if resolved.status == 'completed':
+            # Submitted sessions show their grading status and score
+            session = db.get(Session, resolved.session_id) if resolved.session_id else None
+            assessment = get_assessment_bundle(db, resolved.assessment_id) if session else None
+            if session and assessment:
+                show_completion_screen(db, session, assessment)
+            else:
+                st.success("You have already completed this assessment.")
+                st.info("Assessment completed successfully!")
             return
         
-        if invitation.status == 'completed':
-            st.success("You have already completed this assessment.")
-            st.info("Assessment completed successfully!")
+        if resolved.expires_at < datetime.utcnow():
+            st.error("This assessment link has expired.")
             return
         
-        # Get assessment
-        assessment = db.query(Assessment).filter(Assessment.id == invitation.assessment_id).first()
+        # Assessment and its questions, shared with every other candidate taking it
+        assessment = get_assessment_bundle(db, resolved.assessment_id)
         
         if not assessment:
             st.error("Assessment not found.")
             return
         
         # Check if session exists
-        session = db.query(Session).filter(Session.unique_token == token).first()
+        session = db.get(Session, resolved.session_id) if resolved.session_id else None
         
         if not session:
             # Show consent form
+            invitation = db.get(Invitation, resolved.invitation_id)
+            if not invitation:
+                invalidate_token(token)
+                st.error("Invalid or expired assessment link.")
+                return
             show_consent_form(db, invitation, assessment, token)
         else:
             # Show assessment interface
@@ -104,13 +119,24 @@ def show_consent_form(db, invitation, assessment, token):
         invitation.status = 'started'
         
         db.commit()
+        invalidate_token(token)
+        
+        from src.services.sheet_pool import provisioning_enabled, provision_session_sheets
+        if provisioning_enabled(assessment):
+            questions = assessment.questions
+            with st.spinner("Preparing your sheets..."):
+                errors = provision_session_sheets(db, get_google_sheets_service(), session, assessment, questions)
+            if errors:
+                st.session_state.provision_errors = errors
+            # The clock starts once the sheets are ready
+            session.started_at = datetime.utcnow()
+            db.commit()
         
         st.rerun()
 
 def show_assessment_interface(db, session, assessment):
     """Show the actual assessment interface"""
-    # Get questions
-    questions = db.query(Question).filter(Question.assessment_id == assessment.id).order_by(Question.display_order).all()
+    questions = assessment.questions
     
     if not questions:
         st.error("No questions found for this assessment.")
@@ -121,10 +147,10 @@ def show_assessment_interface(db, session, assessment):
         show_completion_screen(db, session, assessment)
         return
     
-    # Timer
+    # Timer: counts down in the browser; the deadline sweeper submits abandoned sessions
     if session.started_at:
-        elapsed = (datetime.utcnow() - session.started_at).total_seconds() / 60
-        remaining = assessment.duration_minutes - elapsed
+        deadline = session.started_at + timedelta(minutes=assessment.duration_minutes)
+        remaining = (deadline - datetime.utcnow()).total_seconds()
         
         if remaining <= 0:
             # Time's up - auto-submit
@@ -135,21 +161,39 @@ def show_assessment_interface(db, session, assessment):
         with col1:
             st.title(f"📊 {assessment.title}")
         with col2:
-            st.metric("Time Remaining", f"{int(remaining)} min")
+            render_countdown(remaining)
+    
+    # Sheets that could not be created when the session started (see show_consent_form)
+    provision_errors = st.session_state.pop('provision_errors', None)
+    if provision_errors:
+        numbers = ', '.join(f"Q{idx + 1}" for idx, question in enumerate(questions) if question.id in provision_errors)
+        st.warning(f"⚠️ Some sheets could not be prepared ({numbers}). Use \"Create Your Copy\" on those questions.")
+        for error in set(provision_errors.values()):
+            st.caption(f"Error: {error}")
     
     # Question navigation
     if 'current_question_idx' not in st.session_state:
         st.session_state.current_question_idx = 0
     
-    current_idx = st.session_state.current_question_idx
+    current_idx = min(max(st.session_state.current_question_idx, 0), len(questions) - 1)
+    st.session_state.current_question_idx = current_idx
     
-    # Question tabs
-    question_tabs = [f"Q{i+1}" for i in range(len(questions))]
-    tabs = st.tabs(question_tabs)
+    # Question picker: only the selected question is rendered on each rerun
+    question_labels = [f"Q{i+1}" for i in range(len(questions))]
+    selected = st.radio("Question", question_labels, index=current_idx, horizontal=True, label_visibility="collapsed")
+    if question_labels.index(selected) != current_idx:
+        flush_answers(db, session.id)
+        st.session_state.current_question_idx = question_labels.index(selected)
+        st.rerun()
     
-    for idx, (question, tab) in enumerate(zip(questions, tabs)):
-        with tab:
-            display_question(db, session, question, idx)
+    # All of the session's responses in one query, keyed by question
+    responses = {
+        response.question_id: response
+        for response in db.query(Response).filter(Response.session_id == session.id).all()
+    }
+    
+    question = questions[current_idx]
+    display_question(db, session, assessment, question, current_idx, responses.get(question.id))
     
     st.divider()
     
@@ -158,6 +202,7 @@ def show_assessment_interface(db, session, assessment):
     
     with col1:
         if st.button("◀ Previous", disabled=current_idx == 0):
+            flush_answers(db, session.id)
             st.session_state.current_question_idx = max(0, current_idx - 1)
             st.rerun()
     
@@ -166,6 +211,7 @@ def show_assessment_interface(db, session, assessment):
     
     with col3:
         if st.button("Next ▶", disabled=current_idx >= len(questions) - 1):
+            flush_answers(db, session.id)
             st.session_state.current_question_idx = min(len(questions) - 1, current_idx + 1)
             st.rerun()
     
@@ -177,8 +223,8 @@ def show_assessment_interface(db, session, assessment):
             submit_assessment(db, session)
             st.rerun()
 
-def display_question(db, session, question, question_idx):
-    """Display a question and handle responses"""
+def display_question(db, session, assessment, question, question_idx, response=None):
+    """Display a question and handle its response (None if not answered yet)"""
     st.subheader(f"Question {question_idx + 1}: {question.type.upper()}")
     
     if question.section_name:
@@ -187,15 +233,9 @@ def display_question(db, session, question, question_idx):
     st.write(f"**Points:** {question.points}")
     st.write(question.question_text)
     
-    # Check if response exists
-    response = db.query(Response).filter(
-        Response.session_id == session.id,
-        Response.question_id == question.id
-    ).first()
-    
-    google_sheets = get_google_sheets_service()
-    
     if question.type in ['formula', 'data-entry', 'scenario']:
+        google_sheets = get_google_sheets_service()
+        
         # Google Sheet interface
         if question.sheet_template_url:
             st.subheader("Your Work Sheet")
@@ -206,11 +246,13 @@ def display_question(db, session, question, question_idx):
                     sheet_id = google_sheets.extract_sheet_id(question.sheet_template_url)
                     if sheet_id:
                         if st.button(f"Create Your Copy", key=f"copy_{question.id}"):
-                            copy_result = google_sheets.copy_sheet(
-                                sheet_id,
-                                f"{assessment.title} - Q{question_idx + 1} - {session.candidate_email}",
-                                session.candidate_email
-                            )
+                            from src.services.sheet_pool import claim_pooled_sheet
+                            sheet_title = f"{assessment.title} - Q{question_idx + 1} - {session.candidate_email}"
+                            
+                            # A pre-made copy only needs renaming and sharing; copy the template otherwise
+                            copy_result = claim_pooled_sheet(db, google_sheets, sheet_id, sheet_title, session.candidate_email)
+                            if not copy_result:
+                                copy_result = google_sheets.copy_sheet(sheet_id, sheet_title, session.candidate_email)
                             
                             if copy_result.get('success'):
                                 # Save response
@@ -245,49 +287,32 @@ def display_question(db, session, question, question_idx):
         st.write("**Select your answer:**")
         
         # For now, simple text input (could be enhanced with radio buttons)
-        answer_text = st.text_input("Your Answer (A, B, C, or D)", 
-                                   value=response.sheet_url if response else "",
-                                   key=f"mcq_{question.id}")
-        
-        if answer_text and st.button("Save Answer", key=f"save_mcq_{question.id}"):
-            if not response:
-                response = Response(
-                    session_id=session.id,
-                    question_id=question.id,
-                    sheet_url=answer_text  # Store answer in sheet_url for MCQ
-                )
-                db.add(response)
-            else:
-                response.sheet_url = answer_text
-            
-            db.commit()
-            st.success("Answer saved!")
+        # Answers are buffered and written in batches (see src/services/autosave.py)
+        saved_answer = pending_answer(session.id, question.id)
+        if saved_answer is None:
+            saved_answer = response.sheet_url if response else ""  # MCQ answers are stored in sheet_url
+        answer_key = f"mcq_{question.id}"
+        st.text_input("Your Answer (A, B, C, or D)", 
+                      value=saved_answer,
+                      key=answer_key,
+                      on_change=autosave_mcq_answer,
+                      args=(session.id, question.id, answer_key))
+        st.caption("Your answer is saved automatically.")
+
+def autosave_mcq_answer(session_id, question_id, widget_key):
+    """on_change callback: buffer the answer typed into an MCQ input"""
+    buffer_answer(session_id, question_id, st.session_state[widget_key])
 
 def submit_assessment(db, session):
-    """Submit and grade the assessment"""
-    # Get all responses
-    responses = db.query(Response).filter(Response.session_id == session.id).all()
-    
-    from src.services.grading import GradingEngine
-    grading_engine = GradingEngine()
-    
-    total_score = 0
+    """Submit the assessment and queue it for background grading"""
+    from src.services.grading_queue import enqueue_grading
     
-    for response in responses:
-        question = db.query(Question).filter(Question.id == response.question_id).first()
-        if question and response.sheet_url:
-            # Grade the response
-            result = grading_engine.grade_response(question.__dict__, response.sheet_url)
-            
-            response.auto_score = result.get('auto_score', 0)
-            total_score += result.get('auto_score', 0)
-        
-        db.commit()
+    # Grading must see answers still waiting in the autosave buffer
+    flush_answers(db, session.id)
     
     # Update session
     session.status = 'completed'
     session.completed_at = datetime.utcnow()
-    session.final_score = total_score
     
     # Update invitation
     invitation = db.query(Invitation).filter(Invitation.unique_token == session.unique_token).first()
@@ -295,18 +320,27 @@ def submit_assessment(db, session):
         invitation.status = 'completed'
         invitation.completed_at = datetime.utcnow()
     
+    # Grading runs in the worker; the job commits with the submission
+    enqueue_grading(db, session.id)
+    
     db.commit()
+    invalidate_token(session.unique_token)
 
 def show_completion_screen(db, session, assessment):
     """Show completion screen after submission"""
+    from src.services.grading_queue import get_grading_status
+    
     st.title("✅ Assessment Completed!")
     st.success("Thank you for completing the assessment.")
     
     st.subheader("Your Score")
-    if session.final_score is not None:
-        # Calculate total possible points
-        questions = db.query(Question).filter(Question.assessment_id == assessment.id).all()
-        total_points = sum([q.points for q in questions])
+    grading_status = get_grading_status(db, session.id)
+    if grading_status in ('queued', 'running'):
+        st.info("⏳ Grading in progress... your score will appear here shortly.")
+        if st.button("Refresh"):
+            st.rerun()
+    elif session.final_score is not None:
+        total_points = assessment.total_points
         
         percentage = (session.final_score / total_points * 100) if total_points > 0 else 0
         
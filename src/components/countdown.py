@@ -0,0 +1,52 @@
+"""Client-side Countdown Timer Component"""
+
+import time
+import streamlit as st
+import streamlit.components.v1 as components
+
+def render_countdown(remaining_seconds: float, label: str = "Time Remaining", height: int = 80):
+    """Render a timer that counts down in the browser
+    
+    The server passes the seconds left until the session deadline rather
+    than the deadline itself, so a skewed client clock does not shift it.
+    The timer's iframe is sandboxed without top navigation and cannot
+    reload the page; instead a fragment scheduled just past the deadline
+    reruns the app once, which submits the assessment if the deadline
+    sweeper has not already done so.
+    """
+    remaining_ms = max(0, int(remaining_seconds * 1000))
+    rerun_at = time.monotonic() + remaining_seconds
+    
+    @st.fragment(run_every=max(1.0, remaining_seconds + 1))
+    def rerun_after_deadline():
+        # The first run happens with the page itself; only scheduled runs can be past the deadline
+        if time.monotonic() >= rerun_at:
+            st.rerun()
+    
+    rerun_after_deadline()
+    components.html(f"""
+    <div style="font-family: 'Source Sans Pro', sans-serif; color: rgb(49, 51, 63);">
+        <div style="font-size: 14px;">{label}</div>
+        <div id="countdown" style="font-size: 2.25rem; line-height: 1.4;">--:--</div>
+    </div>
+    <script>
+        const end = Date.now() + {remaining_ms};
+        const display = document.getElementById('countdown');
+        function tick() {{
+            const left = Math.max(0, Math.ceil((end - Date.now()) / 1000));
+            const hours = Math.floor(left / 3600);
+            const minutes = String(Math.floor(left % 3600 / 60)).padStart(2, '0');
+            const seconds = String(left % 60).padStart(2, '0');
+            display.textContent = (hours ? hours + ':' : '') + minutes + ':' + seconds;
+            if (left <= 60) {{
+                display.style.color = 'rgb(255, 43, 43)';
+            }}
+            if (left === 0) {{
+                clearInterval(timer);
+                display.textContent = "Time's up";
+            }}
+        }}
+        const timer = setInterval(tick, 1000);
+        tick();
+    </script>
+    """, height=height)
@@ -1,55 +1,201 @@
 """Database initialization and models"""
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON
+from sqlalchemy import create_engine, event, text, Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
 import os
 
 Base = declarative_base()
 
-# Database file path
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'assessments.db')
-os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+# Database file path (DATABASE_PATH overrides the default location)
+DB_PATH = os.environ.get('DATABASE_PATH') or os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'assessments.db')
+os.makedirs(os.path.dirname(os.path.abspath(DB_PATH)), exist_ok=True)
+
+# Engine profiles, selected with the DB_ENGINE_PROFILE environment variable.
+# "production" switches SQLite to WAL so readers no longer block behind the
+# writer, and sizes the pool for Streamlit's thread-per-session model.
+ENGINE_PROFILES = {
+    'default': {
+        'pragmas': {},
+        'pool_size': 5,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,        # ms to wait on a locked database before failing
+            'mmap_size': 268435456,      # 256 MB memory-mapped reads
+            'cache_size': -65536,        # 64 MB page cache (negative = KiB)
+            'temp_store': 'MEMORY',
+        },
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': 30,
+    },
+}
+
+DB_ENGINE_PROFILE = os.environ.get('DB_ENGINE_PROFILE', 'production')
+
+def create_db_engine(db_path=DB_PATH, profile=DB_ENGINE_PROFILE):
+    """Create a SQLite engine configured with the given profile"""
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown database engine profile: {profile}")
+    config = ENGINE_PROFILES[profile]
+    
+    new_engine = create_engine(
+        f'sqlite:///{db_path}',
+        echo=False,
+        poolclass=QueuePool,
+        pool_size=config['pool_size'],
+        max_overflow=config['max_overflow'],
+        pool_timeout=config['pool_timeout'],
+        # Pooled connections are handed between Streamlit script threads
+        connect_args={'check_same_thread': False},
+    )
+    
+    pragmas = config['pragmas']
+    if pragmas:
+        @event.listens_for(new_engine, 'connect')
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name} = {value}")
+            finally:
+                cursor.close()
+    
+    return new_engine
 
 # Create engine
-engine = create_engine(f'sqlite:///{DB_PATH}', echo=False)
+engine = create_db_engine()
 
 # Session factory
 SessionLocal = sessionmaker(bind=engine)
 
+# Schema version recorded in SQLite's PRAGMA user_version.
+# Bump it together with a new entry in MIGRATIONS below.
+SCHEMA_VERSION = 6
+
+def _migrate_is_admin(conn):
+    """v1: add recruiters.is_admin and flag the default admin"""
+    # Inspect existing columns on recruiters
+    result = conn.exec_driver_sql("PRAGMA table_info(recruiters)")
+    columns = [row[1] for row in result.fetchall()]
+
+    # Add is_admin if missing
+    if 'is_admin' not in columns:
+        conn.exec_driver_sql("ALTER TABLE recruiters ADD COLUMN is_admin BOOLEAN DEFAULT 0")
+        print("✅ Added is_admin column to recruiters table")
+
+    # Ensure default admin (if present already) is marked admin
+    conn.exec_driver_sql("UPDATE recruiters SET is_admin = 1 WHERE email = 'admin@example.com'")
+
+def _migrate_lookup_indexes(conn):
+    """v2: create the lookup indexes declared on the models for existing tables"""
+    # The unique (session_id, question_id) index needs duplicates gone first.
+    # Keep the most useful response for each question of a session: reviewed,
+    # then annotated, then auto-graded, then answered; the newest breaks ties.
+    duplicates = conn.exec_driver_sql("""
+        SELECT id, session_id FROM (
+            SELECT id, session_id, ROW_NUMBER() OVER (
+                PARTITION BY session_id, question_id
+                ORDER BY (manual_score IS NOT NULL) DESC,
+                         (COALESCE(reviewer_notes, '') != '') DESC,
+                         (auto_score IS NOT NULL) DESC,
+                         (COALESCE(sheet_url, '') != '') DESC,
+                         id DESC
+            ) AS keep_rank
+            FROM responses
+        ) WHERE keep_rank > 1
+    """).fetchall()
+    if duplicates:
+        ids = [row[0] for row in duplicates]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            conn.exec_driver_sql(
+                f"DELETE FROM responses WHERE id IN ({', '.join('?' * len(chunk))})", tuple(chunk)
+            )
+        session_ids = sorted({row[1] for row in duplicates})
+        print(f"⚠️ Removed {len(ids)} duplicate response(s) (ids {ids}) from session(s) {session_ids}")
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+def _migrate_assessment_counters(conn):
+    """v3: install the counter triggers and backfill assessment_counters"""
+    from src.database.counters import install_counter_triggers, rebuild_counters
+    install_counter_triggers(conn)
+    rebuild_counters(conn)
+
+def _migrate_grading_jobs(conn):
+    """v4: grading job queue table"""
+    GradingJob.__table__.create(conn, checkfirst=True)
+
+def _migrate_sheet_pool(conn):
+    """v5: pool of pre-copied template sheets"""
+    SheetPoolEntry.__table__.create(conn, checkfirst=True)
+
+# Question writes bump the parent assessment's updated_at, which is what
+# cached assessment bundles (src/services/assessment_cache.py) revalidate against.
+# The format matches the one SQLAlchemy stores for DateTime columns.
+_TOUCH_ASSESSMENT = "UPDATE assessments SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', 'now') WHERE id = {row}.assessment_id;"
+
+ASSESSMENT_TOUCH_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_touch_assessment_question_insert AFTER INSERT ON questions BEGIN {_TOUCH_ASSESSMENT.format(row='NEW')} END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_touch_assessment_question_update AFTER UPDATE ON questions BEGIN "
+    f"{_TOUCH_ASSESSMENT.format(row='OLD')} {_TOUCH_ASSESSMENT.format(row='NEW')} END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_touch_assessment_question_delete AFTER DELETE ON questions BEGIN {_TOUCH_ASSESSMENT.format(row='OLD')} END",
+]
+
+def _migrate_assessment_touch(conn):
+    """v6: keep assessments.updated_at current when its questions change"""
+    for statement in ASSESSMENT_TOUCH_TRIGGERS:
+        conn.exec_driver_sql(statement)
+
+# Ordered (version, migration) pairs; each runs once per database
+MIGRATIONS = [
+    (1, _migrate_is_admin),
+    (2, _migrate_lookup_indexes),
+    (3, _migrate_assessment_counters),
+    (4, _migrate_grading_jobs),
+    (5, _migrate_sheet_pool),
+    (6, _migrate_assessment_touch),
+]
+
+def get_schema_version(conn):
+    """Return the schema version stored in the database file"""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables and apply pending migrations
+    
+    Cheap to call repeatedly: once the database is at SCHEMA_VERSION this
+    only reads PRAGMA user_version. Returns True if any work was done.
+    """
+    with engine.connect() as conn:
+        if get_schema_version(conn) >= SCHEMA_VERSION:
+            return False
+    
     # First, create all tables
     Base.metadata.create_all(bind=engine)
     
     # Then run migrations for existing databases
     try:
-        with engine.connect() as conn:
-            # Use SQLAlchemy 2.0 API for executing raw SQL reliably
-            # 1) Inspect existing columns on recruiters
-            result = conn.exec_driver_sql("PRAGMA table_info(recruiters)")
-            columns = [row[1] for row in result.fetchall()]
-
-            # 2) Add is_admin if missing
-            if 'is_admin' not in columns:
-                try:
-                    conn.exec_driver_sql("ALTER TABLE recruiters ADD COLUMN is_admin BOOLEAN DEFAULT 0")
-                    print("✅ Added is_admin column to recruiters table")
-                except Exception as alter_err:
-                    # If the column already exists due to race or prior manual migration, ignore
-                    print(f"ℹ️ is_admin column migration note: {alter_err}")
-
-            # 3) Ensure default admin (if present already) is marked admin
-            try:
-                conn.exec_driver_sql("UPDATE recruiters SET is_admin = 1 WHERE email = 'admin@example.com'")
-            except Exception as update_err:
-                print(f"ℹ️ is_admin update note: {update_err}")
-            
-            conn.commit()
-            print("✅ Migration complete")
+        with engine.begin() as conn:
+            # Re-check inside the transaction in case another process migrated meanwhile
+            current_version = get_schema_version(conn)
+            for version, migration in MIGRATIONS:
+                if version > current_version:
+                    migration(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+        print(f"✅ Migration complete (schema v{SCHEMA_VERSION})")
     except Exception as e:
         print(f"⚠️ Migration warning: {e}")
         # Continue anyway - the app should still work
+    return True
 
 def safe_query_recruiter(email):
     """Safely query recruiter with fallback for missing columns"""
@@ -75,12 +221,15 @@ def get_db():
 # Models
 class Recruiter(Base):
     __tablename__ = 'recruiters'
+    __table_args__ = (
+        Index('ix_recruiters_created_at', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     name = Column(String(255), nullable=False)
-    company = Column(String(255), default='')
+    company = Column(String(255), default='', index=True)
     dashboard_slug = Column(String(100), unique=True, nullable=False)
     branding_settings = Column(JSON, default={})
     storage_config = Column(JSON, default={})
@@ -93,6 +242,10 @@ class Recruiter(Base):
 
 class Assessment(Base):
     __tablename__ = 'assessments'
+    __table_args__ = (
+        # Dashboard / assessments list: WHERE recruiter_id = ? ORDER BY created_at DESC
+        Index('ix_assessments_recruiter_created', 'recruiter_id', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     recruiter_id = Column(Integer, ForeignKey('recruiters.id'), nullable=False)
@@ -110,6 +263,10 @@ class Assessment(Base):
 
 class Question(Base):
     __tablename__ = 'questions'
+    __table_args__ = (
+        # Candidate page / editor: WHERE assessment_id = ? ORDER BY display_order
+        Index('ix_questions_assessment_order', 'assessment_id', 'display_order'),
+    )
     
     id = Column(Integer, primary_key=True)
     assessment_id = Column(Integer, ForeignKey('assessments.id'), nullable=False)
@@ -127,6 +284,10 @@ class Question(Base):
 
 class Invitation(Base):
     __tablename__ = 'invitations'
+    __table_args__ = (
+        Index('ix_invitations_assessment_status', 'assessment_id', 'status'),
+        Index('ix_invitations_recruiter', 'recruiter_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     assessment_id = Column(Integer, ForeignKey('assessments.id'), nullable=False)
@@ -144,6 +305,13 @@ class Invitation(Base):
 
 class Session(Base):
     __tablename__ = 'sessions'
+    __table_args__ = (
+        # Dashboard counts: WHERE assessment_id = ? AND status = ?
+        Index('ix_sessions_assessment_status', 'assessment_id', 'status'),
+        # Sessions page: WHERE assessment_id IN (...) ORDER BY created_at DESC
+        Index('ix_sessions_assessment_created', 'assessment_id', 'created_at'),
+        Index('ix_sessions_status', 'status'),
+    )
     
     id = Column(Integer, primary_key=True)
     assessment_id = Column(Integer, ForeignKey('assessments.id'), nullable=False)
@@ -164,6 +332,11 @@ class Session(Base):
 
 class Response(Base):
     __tablename__ = 'responses'
+    __table_args__ = (
+        # One response per question per session; also serves WHERE session_id = ?
+        Index('uq_responses_session_question', 'session_id', 'question_id', unique=True),
+        Index('ix_responses_question', 'question_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('sessions.id'), nullable=False)
@@ -180,6 +353,9 @@ class Response(Base):
 
 class MonitoringEvent(Base):
     __tablename__ = 'monitoring_events'
+    __table_args__ = (
+        Index('ix_monitoring_events_session_time', 'session_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     session_id = Column(Integer, ForeignKey('sessions.id'), nullable=False)
@@ -189,6 +365,55 @@ class MonitoringEvent(Base):
     severity = Column(String(20), default='low')  # low, medium, high
     event_metadata = Column('metadata', Text)  # Column name in DB is 'metadata', but attribute is 'event_metadata' to avoid conflict
 
+class AssessmentCounter(Base):
+    """Per-assessment counts maintained by SQLite triggers (see src/database/counters.py)"""
+    __tablename__ = 'assessment_counters'
+    
+    assessment_id = Column(Integer, ForeignKey('assessments.id'), primary_key=True)
+    question_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    invitation_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    session_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    in_progress_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    completed_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    pending_review_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
+
+class GradingJob(Base):
+    """Queued auto-grading of a submitted session (see src/services/grading_queue.py)"""
+    __tablename__ = 'grading_jobs'
+    __table_args__ = (
+        # Worker poll: WHERE status = 'queued' AND available_at <= now ORDER BY available_at
+        Index('ix_grading_jobs_status_available', 'status', 'available_at'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey('sessions.id'), unique=True, nullable=False)
+    status = Column(String(20), default='queued')  # queued, running, done, failed
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text)
+    available_at = Column(DateTime, default=datetime.utcnow)  # not picked up before this time (retry backoff)
+    locked_at = Column(DateTime)  # when a worker claimed it; stale locks are reclaimed
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SheetPoolEntry(Base):
+    """Pre-copied template sheet waiting to be handed to a candidate (see src/services/sheet_pool.py)"""
+    __tablename__ = 'sheet_pool'
+    __table_args__ = (
+        # Claim: WHERE template_sheet_id = ? AND status = 'ready' ORDER BY created_at
+        Index('ix_sheet_pool_template_status', 'template_sheet_id', 'status', 'created_at'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    template_sheet_id = Column(String(100), nullable=False)
+    template_revision = Column(String(100))  # Drive modifiedTime:version the copy was made from
+    sheet_id = Column(String(100), unique=True, nullable=False)
+    status = Column(String(20), default='ready')  # ready, assigned, stale
+    created_at = Column(DateTime, default=datetime.utcnow)
+    assigned_at = Column(DateTime)
+
+# Read-only: rows are written by the triggers, never through the ORM
+Assessment.counters = relationship(AssessmentCounter, uselist=False, viewonly=True, lazy="select")
+
 # Configure the relationship on Session after MonitoringEvent is fully defined
 # This breaks the circular dependency that causes InvalidRequestError in SQLAlchemy 2.0+
 from sqlalchemy.orm import configure_mappers
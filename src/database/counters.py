@@ -0,0 +1,147 @@
+"""
+Materialized per-assessment counters
+
+The assessment_counters table is kept current by SQLite triggers, so every
+writer (ORM, bulk deletes, manual SQL) updates it in the same transaction
+as the row change. Per-recruiter figures are a SUM over the recruiter's
+counter rows, i.e. O(assessments) instead of O(invitations + sessions + responses).
+
+Drift repair:
+    python -m src.database.counters check
+    python -m src.database.counters rebuild
+"""
+
+import sys
+
+COUNTER_COLUMNS = [
+    'question_count',
+    'invitation_count',
+    'session_count',
+    'in_progress_count',
+    'completed_count',
+    'pending_review_count',
+]
+
+# Fresh computation of every counter, used for rebuilds and drift checks
+_COMPUTED_COUNTERS_SQL = """
+    SELECT
+        a.id AS assessment_id,
+        (SELECT COUNT(*) FROM questions q WHERE q.assessment_id = a.id) AS question_count,
+        (SELECT COUNT(*) FROM invitations i WHERE i.assessment_id = a.id) AS invitation_count,
+        (SELECT COUNT(*) FROM sessions s WHERE s.assessment_id = a.id) AS session_count,
+        (SELECT COUNT(*) FROM sessions s WHERE s.assessment_id = a.id AND s.status = 'in_progress') AS in_progress_count,
+        (SELECT COUNT(*) FROM sessions s WHERE s.assessment_id = a.id AND s.status = 'completed') AS completed_count,
+        (SELECT COUNT(*) FROM responses r JOIN sessions s ON s.id = r.session_id
+            WHERE s.assessment_id = a.id AND r.auto_score IS NOT NULL AND r.manual_score IS NULL) AS pending_review_count
+    FROM assessments a
+"""
+
+def _flag(condition):
+    return f"(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+
+def _bump(assessment_expr, sign, deltas):
+    """SQL statements adding sign * delta to the counters of one assessment"""
+    assignments = ', '.join(f"{column} = {column} {sign} {delta}" for column, delta in deltas.items())
+    return f"""
+        INSERT OR IGNORE INTO assessment_counters (assessment_id)
+            SELECT aid FROM (SELECT {assessment_expr} AS aid) WHERE aid IS NOT NULL;
+        UPDATE assessment_counters SET {assignments}
+            WHERE assessment_id = {assessment_expr};"""
+
+def _session_deltas(row):
+    return {
+        'session_count': '1',
+        'in_progress_count': _flag(f"{row}.status = 'in_progress'"),
+        'completed_count': _flag(f"{row}.status = 'completed'"),
+    }
+
+def _pending_delta(row):
+    return {'pending_review_count': _flag(f"{row}.auto_score IS NOT NULL AND {row}.manual_score IS NULL")}
+
+def _session_assessment(row):
+    return f"(SELECT assessment_id FROM sessions WHERE id = {row}.session_id)"
+
+def _trigger(name, event, table, body):
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN {body} END"
+
+COUNTER_TRIGGERS = [
+    _trigger('trg_counters_assessment_insert', 'INSERT', 'assessments',
+             "INSERT OR IGNORE INTO assessment_counters (assessment_id) VALUES (NEW.id);"),
+    _trigger('trg_counters_assessment_delete', 'DELETE', 'assessments',
+             "DELETE FROM assessment_counters WHERE assessment_id = OLD.id;"),
+    
+    _trigger('trg_counters_question_insert', 'INSERT', 'questions',
+             _bump('NEW.assessment_id', '+', {'question_count': '1'})),
+    _trigger('trg_counters_question_delete', 'DELETE', 'questions',
+             _bump('OLD.assessment_id', '-', {'question_count': '1'})),
+    _trigger('trg_counters_question_move', 'UPDATE OF assessment_id', 'questions',
+             _bump('OLD.assessment_id', '-', {'question_count': '1'}) + _bump('NEW.assessment_id', '+', {'question_count': '1'})),
+    
+    _trigger('trg_counters_invitation_insert', 'INSERT', 'invitations',
+             _bump('NEW.assessment_id', '+', {'invitation_count': '1'})),
+    _trigger('trg_counters_invitation_delete', 'DELETE', 'invitations',
+             _bump('OLD.assessment_id', '-', {'invitation_count': '1'})),
+    _trigger('trg_counters_invitation_move', 'UPDATE OF assessment_id', 'invitations',
+             _bump('OLD.assessment_id', '-', {'invitation_count': '1'}) + _bump('NEW.assessment_id', '+', {'invitation_count': '1'})),
+    
+    _trigger('trg_counters_session_insert', 'INSERT', 'sessions',
+             _bump('NEW.assessment_id', '+', _session_deltas('NEW'))),
+    _trigger('trg_counters_session_delete', 'DELETE', 'sessions',
+             _bump('OLD.assessment_id', '-', _session_deltas('OLD'))),
+    _trigger('trg_counters_session_update', 'UPDATE OF status, assessment_id', 'sessions',
+             _bump('OLD.assessment_id', '-', _session_deltas('OLD')) + _bump('NEW.assessment_id', '+', _session_deltas('NEW'))),
+    
+    _trigger('trg_counters_response_insert', 'INSERT', 'responses',
+             _bump(_session_assessment('NEW'), '+', _pending_delta('NEW'))),
+    _trigger('trg_counters_response_delete', 'DELETE', 'responses',
+             _bump(_session_assessment('OLD'), '-', _pending_delta('OLD'))),
+    _trigger('trg_counters_response_update', 'UPDATE OF auto_score, manual_score, session_id', 'responses',
+             _bump(_session_assessment('OLD'), '-', _pending_delta('OLD')) + _bump(_session_assessment('NEW'), '+', _pending_delta('NEW'))),
+]
+
+def install_counter_triggers(conn):
+    """Create the triggers that keep assessment_counters current"""
+    for ddl in COUNTER_TRIGGERS:
+        conn.exec_driver_sql(ddl)
+
+def rebuild_counters(conn):
+    """Recompute every counter row from the raw tables"""
+    columns = ', '.join(COUNTER_COLUMNS)
+    conn.exec_driver_sql("DELETE FROM assessment_counters")
+    conn.exec_driver_sql(f"INSERT INTO assessment_counters (assessment_id, {columns}) "
+                         f"SELECT assessment_id, {columns} FROM ({_COMPUTED_COUNTERS_SQL})")
+
+def find_counter_drift(conn):
+    """Return assessment IDs whose stored counters differ from the raw tables"""
+    mismatch = ' OR '.join(f"c.{column} IS NOT f.{column}" for column in COUNTER_COLUMNS)
+    result = conn.exec_driver_sql(f"""
+        SELECT f.assessment_id
+        FROM ({_COMPUTED_COUNTERS_SQL}) f
+        LEFT JOIN assessment_counters c ON c.assessment_id = f.assessment_id
+        WHERE c.assessment_id IS NULL OR {mismatch}
+    """)
+    return [row[0] for row in result.fetchall()]
+
+def main(argv):
+    from src.database import engine, init_db
+    
+    command = argv[1] if len(argv) > 1 else 'check'
+    init_db()
+    if command == 'rebuild':
+        with engine.begin() as conn:
+            rebuild_counters(conn)
+        print("✅ Assessment counters rebuilt")
+    elif command == 'check':
+        with engine.connect() as conn:
+            drifted = find_counter_drift(conn)
+        if drifted:
+            print(f"⚠️ Counter drift on assessments: {drifted}. Run 'python -m src.database.counters rebuild'.")
+            return 1
+        print("✅ Assessment counters are consistent")
+    else:
+        print("Usage: python -m src.database.counters [check|rebuild]")
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,106 @@
+"""
+Process-wide cache of assessment content for candidate pages
+
+Every candidate rerun used to reload the assessment and its ordered
+questions, although neither changes while a test is running. A bundle
+holds both plus the points total as read-only __slots__ objects and is
+shared by every candidate session in the process.
+
+Bundles are versioned by assessments.updated_at, which SQLite triggers
+bump on any question insert, update or delete. Within ASSESSMENT_CACHE_TTL
+seconds of the last check a bundle is served without touching the
+database; after that one primary-key lookup of updated_at decides whether
+it is still current.
+"""
+
+import os
+import threading
+import time
+from src.database import Assessment, Question
+
+# Seconds a bundle is trusted before its updated_at is re-checked (0 checks on every load)
+ASSESSMENT_CACHE_TTL = float(os.environ.get('ASSESSMENT_CACHE_TTL', 5))
+
+class _ReadOnly:
+    """Base for cached objects shared between sessions"""
+    __slots__ = ()
+    
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+class QuestionView(_ReadOnly):
+    """Question fields the candidate page renders"""
+    __slots__ = ('id', 'assessment_id', 'type', 'question_text', 'sheet_template_url',
+                 'points', 'display_order', 'section_name')
+
+class AssessmentBundle(_ReadOnly):
+    """An assessment, its questions in display order and their points total"""
+    __slots__ = ('id', 'recruiter_id', 'title', 'description', 'duration_minutes', 'settings',
+                 'updated_at', 'questions', 'total_points')
+
+def _columns(model, names):
+    return [getattr(model, name) for name in names]
+
+def load_assessment_bundle(db, assessment_id: int):
+    """Build a bundle from the database; None if the assessment does not exist"""
+    bundle_fields = [name for name in AssessmentBundle.__slots__ if name not in ('questions', 'total_points')]
+    row = db.query(*_columns(Assessment, bundle_fields)).filter(Assessment.id == assessment_id).first()
+    if not row:
+        return None
+    
+    questions = tuple(
+        QuestionView(**question._asdict())
+        for question in db.query(*_columns(Question, QuestionView.__slots__)).filter(
+            Question.assessment_id == assessment_id
+        ).order_by(Question.display_order, Question.id).all()
+    )
+    return AssessmentBundle(
+        **row._asdict(),
+        questions=questions,
+        total_points=sum(question.points or 0 for question in questions)
+    )
+
+# assessment_id -> (bundle, monotonic time of the last updated_at check)
+_bundles = {}
+_bundles_lock = threading.Lock()
+
+def get_assessment_bundle(db, assessment_id: int):
+    """Cached bundle for the assessment, reloaded when its updated_at moves"""
+    now = time.monotonic()
+    with _bundles_lock:
+        cached = _bundles.get(assessment_id)
+    if cached and now - cached[1] < ASSESSMENT_CACHE_TTL:
+        return cached[0]
+    
+    if cached:
+        updated_at = db.query(Assessment.updated_at).filter(Assessment.id == assessment_id).first()
+        if updated_at is None:
+            invalidate_assessment_bundle(assessment_id)
+            return None
+        if updated_at[0] == cached[0].updated_at:
+            with _bundles_lock:
+                _bundles[assessment_id] = (cached[0], now)
+            return cached[0]
+    
+    bundle = load_assessment_bundle(db, assessment_id)
+    with _bundles_lock:
+        if bundle:
+            _bundles[assessment_id] = (bundle, now)
+        else:
+            _bundles.pop(assessment_id, None)
+    return bundle
+
+def invalidate_assessment_bundle(assessment_id: int = None):
+    """Drop one cached bundle, or all of them"""
+    with _bundles_lock:
+        if assessment_id is None:
+            _bundles.clear()
+        else:
+            _bundles.pop(assessment_id, None)
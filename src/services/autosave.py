@@ -0,0 +1,191 @@
+"""
+Debounced autosave of MCQ answers
+
+Every "Save Answer" click used to be its own write transaction, and SQLite
+serializes writers, so answer saves queued behind each other at the start
+and end of a test window. Answers are now buffered in memory per session
+and written with one upsert per flush:
+
+- on navigation and on submit, for that session;
+- once a session has had no changes for AUTOSAVE_DEBOUNCE seconds, or has
+  held unsaved changes for AUTOSAVE_MAX_DELAY seconds, by a flusher thread
+  that writes every due session in the same transaction;
+- at interpreter exit and before the deadline sweeper submits sessions.
+
+A failed write puts the answers back in the buffer unless a newer answer
+arrived meanwhile, so they are retried on the next flush.
+
+Only answers given while their session is in progress and before its
+deadline are written: a stale tab cannot change a submitted session
+whose grading job may still be queued. Answers that arrive too late are
+dropped at the next flush.
+"""
+
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import text
+from src.database import SessionLocal
+
+# Quiet period before a session's answers are written, and the longest any answer stays unsaved (seconds)
+AUTOSAVE_DEBOUNCE = float(os.environ.get('AUTOSAVE_DEBOUNCE', 2))
+AUTOSAVE_MAX_DELAY = float(os.environ.get('AUTOSAVE_MAX_DELAY', 10))
+
+# Flusher poll interval (seconds)
+AUTOSAVE_POLL_INTERVAL = float(os.environ.get('AUTOSAVE_POLL_INTERVAL', 0.5))
+
+# Upsert that only touches sessions still open when the answer was given; MCQ answers
+# are stored in sheet_url and (session_id, question_id) is unique. SQLite needs the
+# WHERE on the SELECT to parse ON CONFLICT after INSERT ... SELECT.
+_UPSERT_SQL = text("""
+    INSERT INTO responses (session_id, question_id, sheet_url, created_at)
+    SELECT :session_id, :question_id, :answer, :created_at
+    WHERE EXISTS (
+        SELECT 1 FROM sessions s JOIN assessments a ON a.id = s.assessment_id
+        WHERE s.id = :session_id
+          AND s.status = 'in_progress'
+          AND (s.started_at IS NULL
+               OR datetime(s.started_at, '+' || COALESCE(a.duration_minutes, 60) || ' minutes') >= :answered_at)
+    )
+    ON CONFLICT (session_id, question_id) DO UPDATE SET sheet_url = excluded.sheet_url
+""")
+
+class _PendingAnswers:
+    """Unsaved answers of one session: question_id -> (answer, UTC time it was given)"""
+    __slots__ = ('answers', 'first_change', 'last_change')
+    
+    def __init__(self, now):
+        self.answers = {}
+        self.first_change = now
+        self.last_change = now
+
+# session_id -> _PendingAnswers
+_pending = {}
+_pending_lock = threading.Lock()
+
+def buffer_answer(session_id: int, question_id: int, answer: str):
+    """Record an answer; it is written on the next flush of its session"""
+    now = time.monotonic()
+    answered_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    with _pending_lock:
+        pending = _pending.get(session_id)
+        if pending is None:
+            pending = _pending[session_id] = _PendingAnswers(now)
+        pending.answers[question_id] = (answer, answered_at)
+        pending.last_change = now
+
+def pending_answer(session_id: int, question_id: int):
+    """An answer not written yet, or None"""
+    with _pending_lock:
+        pending = _pending.get(session_id)
+        buffered = pending.answers.get(question_id) if pending else None
+        return buffered[0] if buffered else None
+
+def _take(session_ids):
+    """Remove and return {session_id: {question_id: (answer, answered_at)}} from the buffer"""
+    with _pending_lock:
+        return {
+            session_id: _pending.pop(session_id).answers
+            for session_id in session_ids if session_id in _pending
+        }
+
+def _restore(taken):
+    """Put answers back after a failed write, keeping any newer ones"""
+    now = time.monotonic()
+    with _pending_lock:
+        for session_id, answers in taken.items():
+            pending = _pending.get(session_id)
+            if pending is None:
+                pending = _pending[session_id] = _PendingAnswers(now)
+            for question_id, answer in answers.items():
+                pending.answers.setdefault(question_id, answer)
+
+def _write(db, taken) -> int:
+    """Upsert the answers in one transaction; returns answers written
+    
+    Answers for sessions that were submitted, or given after the deadline,
+    are not written and are not put back.
+    """
+    now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')
+    rows = [
+        {'session_id': session_id, 'question_id': question_id, 'answer': answer,
+         'answered_at': answered_at, 'created_at': now}
+        for session_id, answers in taken.items()
+        for question_id, (answer, answered_at) in answers.items()
+    ]
+    if not rows:
+        return 0
+    try:
+        written = db.execute(_UPSERT_SQL, rows).rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        _restore(taken)
+        raise
+    if written < len(rows):
+        print(f"⚠️ Autosave dropped {len(rows) - written} answer(s) for closed sessions")
+    return written
+
+def flush_answers(db, session_id: int) -> int:
+    """Write one session's buffered answers now (navigation, submit)"""
+    return _write(db, _take([session_id]))
+
+def flush_due(now=None) -> int:
+    """Write every session past its debounce or maximum delay"""
+    now = time.monotonic() if now is None else now
+    with _pending_lock:
+        due = [
+            session_id for session_id, pending in _pending.items()
+            if now - pending.last_change >= AUTOSAVE_DEBOUNCE or now - pending.first_change >= AUTOSAVE_MAX_DELAY
+        ]
+    if not due:
+        return 0
+    db = SessionLocal()
+    try:
+        return _write(db, _take(due))
+    finally:
+        db.close()
+
+def flush_all() -> int:
+    """Write every buffered answer"""
+    with _pending_lock:
+        session_ids = list(_pending)
+    if not session_ids:
+        return 0
+    db = SessionLocal()
+    try:
+        return _write(db, _take(session_ids))
+    finally:
+        db.close()
+
+def flusher_loop(stop_event=None):
+    """Flush due sessions every AUTOSAVE_POLL_INTERVAL seconds (or until stop_event is set)"""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        try:
+            flush_due()
+        except Exception as e:
+            print(f"⚠️ Autosave flush error: {e}")
+        stop_event.wait(AUTOSAVE_POLL_INTERVAL)
+
+def _flush_at_exit():
+    try:
+        flush_all()
+    except Exception as e:
+        print(f"⚠️ Autosave flush at exit failed: {e}")
+
+atexit.register(_flush_at_exit)
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+def start_autosave_flusher():
+    """Start the flusher thread once; safe to call on every rerun"""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=flusher_loop, name='autosave-flusher', daemon=True)
+            _worker_thread.start()
+    return _worker_thread
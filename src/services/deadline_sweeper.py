@@ -0,0 +1,128 @@
+"""
+Server-side assessment deadlines
+
+The candidate page only noticed an expired session when the candidate
+caused a rerun, so an abandoned tab stayed in progress indefinitely. A
+sweeper thread (started once per Streamlit process) or a standalone
+process submits every in-progress session past started_at +
+duration_minutes in bulk: one UPDATE marks the sessions completed, one
+marks their invitations completed, and grading jobs are queued in the
+same transaction.
+
+Run a standalone sweeper with:
+    python -m src.services.deadline_sweeper
+
+A standalone sweeper cannot flush the app's autosave buffer, so the grace
+period is never shorter than the longest an MCQ answer given before the
+deadline can stay buffered in the app process (AUTOSAVE_MAX_DELAY plus
+one flusher poll).
+"""
+
+import math
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import String, cast, func, literal, select, update
+from src.database import SessionLocal, Session, Assessment, Invitation
+from src.services.autosave import AUTOSAVE_MAX_DELAY, AUTOSAVE_POLL_INTERVAL
+
+# Seconds between sweeps, grace period after the deadline, and sessions submitted per sweep
+DEADLINE_SWEEP_INTERVAL = float(os.environ.get('DEADLINE_SWEEP_INTERVAL', 30))
+DEADLINE_GRACE_SECONDS = max(int(os.environ.get('DEADLINE_GRACE_SECONDS', 15)),
+                             math.ceil(AUTOSAVE_MAX_DELAY + AUTOSAVE_POLL_INTERVAL))
+DEADLINE_SWEEP_BATCH = int(os.environ.get('DEADLINE_SWEEP_BATCH', 500))
+
+def _expired_session_ids(now):
+    """In-progress sessions whose deadline plus the grace period has passed"""
+    # SQLite date arithmetic: datetime(started_at, '+<minutes> minutes', '+<grace> seconds')
+    minutes = literal('+') + cast(func.coalesce(Assessment.duration_minutes, 60), String) + literal(' minutes')
+    deadline = func.datetime(Session.started_at, minutes, f"+{DEADLINE_GRACE_SECONDS} seconds")
+    return select(Session.id).join(
+        Assessment, Assessment.id == Session.assessment_id
+    ).where(
+        Session.status == 'in_progress',
+        Session.started_at.isnot(None),
+        deadline <= now.strftime('%Y-%m-%d %H:%M:%S')
+    ).limit(DEADLINE_SWEEP_BATCH).correlate(None)
+
+def submit_expired_sessions(db, now=None) -> list:
+    """Submit one batch of expired sessions and queue their grading; returns their tokens"""
+    from src.services.grading_queue import enqueue_grading
+    now = now or datetime.utcnow()
+    
+    # The status condition is re-checked by the UPDATE itself, so a candidate
+    # submitting at the same moment is never submitted twice
+    submitted = db.execute(
+        update(Session).where(
+            Session.id.in_(_expired_session_ids(now)),
+            Session.status == 'in_progress'
+        ).values(status='completed', completed_at=now).returning(Session.id, Session.unique_token),
+        execution_options={'synchronize_session': False}
+    ).all()
+    if not submitted:
+        db.rollback()
+        return []
+    
+    tokens = [token for _, token in submitted]
+    db.execute(
+        update(Invitation).where(
+            Invitation.unique_token.in_(tokens),
+            Invitation.status != 'completed'
+        ).values(status='completed', completed_at=now),
+        execution_options={'synchronize_session': False}
+    )
+    for session_id, _ in submitted:
+        enqueue_grading(db, session_id)
+    db.commit()
+    return tokens
+
+def sweep_deadlines() -> int:
+    """Submit every expired session; returns how many were submitted"""
+    from src.services.autosave import flush_all
+    from src.services.token_cache import invalidate_token
+    
+    # Buffered answers count towards the sessions about to be submitted (in-process only)
+    flush_all()
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            tokens = submit_expired_sessions(db)
+            for token in tokens:
+                invalidate_token(token)
+            total += len(tokens)
+            if len(tokens) < DEADLINE_SWEEP_BATCH:
+                break
+        if total:
+            print(f"⏰ Auto-submitted {total} session(s) past their deadline")
+        return total
+    finally:
+        db.close()
+
+def sweeper_loop(stop_event=None):
+    """Sweep every DEADLINE_SWEEP_INTERVAL seconds (or until stop_event is set)"""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        try:
+            sweep_deadlines()
+        except Exception as e:
+            print(f"⚠️ Deadline sweeper error: {e}")
+        stop_event.wait(DEADLINE_SWEEP_INTERVAL)
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+def start_deadline_sweeper():
+    """Start the sweeper thread once; safe to call on every rerun"""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=sweeper_loop, name='deadline-sweeper', daemon=True)
+            _worker_thread.start()
+    return _worker_thread
+
+if __name__ == "__main__":
+    from src.database import init_db
+    init_db()
+    print("✅ Deadline sweeper started")
+    sweeper_loop()
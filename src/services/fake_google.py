@@ -0,0 +1,462 @@
+"""
+In-process stand-in for the Google Sheets and Drive APIs
+
+FakeGoogleBackend mimics the googleapiclient resource interface that
+GoogleSheetsAPI uses (spreadsheets, values, files, permissions and batch
+requests), so the real client code - request execution, retries, batching
+and grid parsing - runs unchanged without credentials or network access.
+Spreadsheets live in memory, optionally persisted to a JSON file, and every
+request can be delayed and made to fail at a configurable rate.
+
+Use it with GoogleSheetsAPI(backend=FakeGoogleBackend(...)), or for the
+whole app by setting GOOGLE_SHEETS_BACKEND=fake (or fake:/path/to/store.json).
+
+Cells are stored per tab as {'B2': value}; a value is a number, a string,
+or {'formula': '=SUM(A1:A3)', 'value': 6} for a formula and the result it
+should report (formulas are never evaluated).
+"""
+
+import copy
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+import httplib2
+from googleapiclient.errors import HttpError
+from src.services.google_sheets import column_label, column_index
+
+# Defaults for backends created from GOOGLE_SHEETS_BACKEND
+FAKE_GOOGLE_LATENCY = float(os.environ.get('FAKE_GOOGLE_LATENCY', 0))
+FAKE_GOOGLE_ERROR_RATE = float(os.environ.get('FAKE_GOOGLE_ERROR_RATE', 0))
+
+A1_PATTERN = re.compile(r'^([A-Z]+)?([0-9]+)?$')
+
+def _split_cell(cell_ref: str):
+    """'B12' -> (row 11, column 1)"""
+    match = re.match(r'^([A-Z]+)([0-9]+)$', cell_ref.upper())
+    return int(match.group(2)) - 1, column_index(match.group(1))
+
+def _http_error(status: int, message: str) -> HttpError:
+    content = json.dumps({'error': {'code': status, 'message': message}}).encode('utf-8')
+    return HttpError(httplib2.Response({'status': status}), content)
+
+class FakeRequest:
+    """Deferred operation with the execute() signature of googleapiclient's HttpRequest"""
+    
+    def __init__(self, backend, method_id: str, operation):
+        self.backend = backend
+        self.methodId = method_id
+        self._operation = operation
+    
+    def execute(self, http=None, num_retries=0):
+        self.backend.simulate_network(self.methodId)
+        return self._run()
+    
+    def _run(self):
+        return self._operation()
+
+class FakeBatch:
+    """Batch request: one simulated round trip, per-request results via the callback"""
+    
+    def __init__(self, backend, callback=None):
+        self.backend = backend
+        self._callback = callback
+        self._requests = []
+    
+    def add(self, request, callback=None, request_id=None):
+        request_id = request_id if request_id is not None else str(len(self._requests))
+        self._requests.append((request_id, request, callback or self._callback))
+    
+    def execute(self, http=None):
+        # The batch takes as long as its slowest request
+        self.backend.simulate_network(*[request.methodId for _, request, _ in self._requests])
+        for request_id, request, callback in self._requests:
+            try:
+                # Inner requests can fail independently of the batch
+                self.backend.maybe_fail()
+                response, exception = request._run(), None
+            except HttpError as e:
+                response, exception = None, e
+            if callback:
+                callback(request_id, response, exception)
+
+class FakeGoogleBackend:
+    """Spreadsheets and Drive files held in memory (and optionally a JSON file)"""
+    
+    def __init__(self, storage_path: str = None, latency: float = FAKE_GOOGLE_LATENCY,
+                 error_rate: float = FAKE_GOOGLE_ERROR_RATE, error_status: int = 503, seed: int = None,
+                 method_latency: dict = None):
+        self.storage_path = storage_path
+        self.latency = latency
+        # Per-method overrides, e.g. {'drive.files.copy': 1.5}
+        self.method_latency = dict(method_latency or {})
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._files = {}
+        if storage_path and os.path.exists(storage_path):
+            with open(storage_path, 'r') as f:
+                self._files = json.load(f)
+    
+    # Test helpers
+    
+    def add_spreadsheet(self, title: str, cells: dict = None, sheet_id: str = None) -> str:
+        """Create a spreadsheet from {tab: {cell_ref: value}}; returns its ID"""
+        with self._lock:
+            sheet_id = sheet_id or f"fake-{uuid.uuid4().hex[:16]}"
+            self._files[sheet_id] = {
+                'name': title,
+                'tabs': {tab: dict(tab_cells) for tab, tab_cells in (cells or {'Sheet1': {}}).items()},
+                'permissions': [],
+                'version': 1,
+                'modifiedTime': self._now()
+            }
+            self._save()
+            return sheet_id
+    
+    def set_cells(self, sheet_id: str, cells: dict, tab: str = None):
+        """Overwrite cells of a tab (the first one by default), as a user edit would"""
+        with self._lock:
+            spreadsheet = self._get(sheet_id)
+            tab = tab or next(iter(spreadsheet['tabs']))
+            spreadsheet['tabs'].setdefault(tab, {}).update(cells)
+            self._touch(spreadsheet)
+    
+    def spreadsheet(self, sheet_id: str) -> dict:
+        """Deep copy of a stored spreadsheet, for assertions"""
+        with self._lock:
+            return copy.deepcopy(self._get(sheet_id))
+    
+    # Service objects handed to GoogleSheetsAPI
+    
+    def sheets(self):
+        return _SheetsService(self)
+    
+    def drive(self):
+        return _DriveService(self)
+    
+    # Failure and latency simulation
+    
+    def simulate_network(self, *method_ids):
+        """One round trip: count it, sleep for the slowest method's latency, maybe fail"""
+        with self._lock:
+            self.calls += 1
+        latency = max([self.method_latency.get(method_id, self.latency) for method_id in method_ids] or [self.latency])
+        if latency:
+            time.sleep(latency)
+        self.maybe_fail()
+    
+    def maybe_fail(self):
+        if self.error_rate:
+            with self._lock:
+                failed = self._random.random() < self.error_rate
+            if failed:
+                raise _http_error(self.error_status, 'Injected failure')
+    
+    # Storage
+    
+    def _now(self) -> str:
+        return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    
+    def _get(self, sheet_id: str) -> dict:
+        spreadsheet = self._files.get(sheet_id)
+        if spreadsheet is None:
+            raise _http_error(404, f"File not found: {sheet_id}")
+        return spreadsheet
+    
+    def _touch(self, spreadsheet: dict):
+        spreadsheet['version'] += 1
+        spreadsheet['modifiedTime'] = self._now()
+        self._save()
+    
+    def _save(self):
+        if not self.storage_path:
+            return
+        tmp_path = f"{self.storage_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._files, f)
+        os.replace(tmp_path, self.storage_path)
+    
+    def _resolve_range(self, spreadsheet: dict, range_name: str):
+        """'Tab!B2:C5' -> (tab, start_row, start_col, end_row, end_col), ends exclusive or None"""
+        tab, _, cells = range_name.rpartition('!')
+        tab = tab.strip("'") if tab else next(iter(spreadsheet['tabs']))
+        if tab not in spreadsheet['tabs']:
+            raise _http_error(400, f"Unable to parse range: {range_name}")
+        start, _, end = cells.upper().partition(':')
+        end = end or start
+        start_match, end_match = A1_PATTERN.match(start), A1_PATTERN.match(end)
+        if not start_match or not end_match:
+            raise _http_error(400, f"Unable to parse range: {range_name}")
+        start_row = int(start_match.group(2)) - 1 if start_match.group(2) else 0
+        start_col = column_index(start_match.group(1)) if start_match.group(1) else 0
+        end_row = int(end_match.group(2)) if end_match.group(2) else None
+        end_col = column_index(end_match.group(1)) + 1 if end_match.group(1) else None
+        return tab, start_row, start_col, end_row, end_col
+    
+    def _window(self, tab_cells: dict, start_row=0, start_col=0, end_row=None, end_col=None):
+        """Rows of raw values in a window, trailing empty rows/cells trimmed like the real API"""
+        positioned = {}
+        for cell_ref, value in tab_cells.items():
+            row, col = _split_cell(cell_ref)
+            if row >= start_row and col >= start_col and (end_row is None or row < end_row) and (end_col is None or col < end_col):
+                positioned[(row, col)] = value
+        if not positioned:
+            return []
+        
+        last_row = max(row for row, _ in positioned)
+        rows = []
+        for row in range(start_row, last_row + 1):
+            columns = [col for r, col in positioned if r == row]
+            last_col = max(columns) if columns else start_col - 1
+            rows.append([positioned.get((row, col)) for col in range(start_col, last_col + 1)])
+        return rows
+    
+    def _grid(self, tab_cells: dict, start_row=0, start_col=0, end_row=None, end_col=None) -> dict:
+        """GridData for a window of a tab"""
+        grid = {}
+        if start_row:
+            grid['startRow'] = start_row
+        if start_col:
+            grid['startColumn'] = start_col
+        rows = self._window(tab_cells, start_row, start_col, end_row, end_col)
+        if rows:
+            grid['rowData'] = [
+                {'values': [self._cell_data(value) for value in row]} if row else {}
+                for row in rows
+            ]
+        return grid
+    
+    def _cell_data(self, value) -> dict:
+        if value is None:
+            return {}
+        if isinstance(value, dict):
+            cell = {'userEnteredValue': {'formulaValue': value['formula']}}
+            result = value.get('value')
+        else:
+            key = 'stringValue' if isinstance(value, str) else 'boolValue' if isinstance(value, bool) else 'numberValue'
+            cell = {'userEnteredValue': {key: value}}
+            result = value
+        if result is not None:
+            key = 'stringValue' if isinstance(result, str) else 'boolValue' if isinstance(result, bool) else 'numberValue'
+            cell['effectiveValue'] = {key: result}
+        return cell
+    
+    def _formatted(self, value) -> str:
+        if isinstance(value, dict):
+            value = value.get('value')
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return 'TRUE' if value else 'FALSE'
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+    
+    def _user_entered(self, value):
+        """Interpret a written value as the Sheets UI would (USER_ENTERED)"""
+        if isinstance(value, str):
+            if value.startswith('='):
+                return {'formula': value, 'value': None}
+            try:
+                number = float(value)
+                return int(number) if number.is_integer() else number
+            except ValueError:
+                return value
+        return value
+
+class _SheetsService:
+    def __init__(self, backend):
+        self.backend = backend
+    
+    def spreadsheets(self):
+        return _Spreadsheets(self.backend)
+    
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self.backend, callback)
+
+class _Spreadsheets:
+    def __init__(self, backend):
+        self.backend = backend
+    
+    def values(self):
+        return _Values(self.backend)
+    
+    def create(self, body=None, **kwargs):
+        def run():
+            body_ = body or {}
+            tabs = {sheet['properties']['title']: {} for sheet in body_.get('sheets', [])} or {'Sheet1': {}}
+            sheet_id = self.backend.add_spreadsheet(body_.get('properties', {}).get('title', 'Untitled spreadsheet'))
+            with self.backend._lock:
+                self.backend._files[sheet_id]['tabs'] = tabs
+                self.backend._save()
+            return {'spreadsheetId': sheet_id, 'properties': {'title': self.backend._files[sheet_id]['name']}}
+        return FakeRequest(self.backend, 'sheets.spreadsheets.create', run)
+    
+    def get(self, spreadsheetId, includeGridData=False, ranges=None, fields=None, **kwargs):
+        def run():
+            with self.backend._lock:
+                spreadsheet = self.backend._get(spreadsheetId)
+                sheets = []
+                requested = {}
+                for range_name in ([ranges] if isinstance(ranges, str) else ranges or []):
+                    resolved = self.backend._resolve_range(spreadsheet, range_name)
+                    requested.setdefault(resolved[0], []).append(resolved[1:])
+                for index, (tab, tab_cells) in enumerate(spreadsheet['tabs'].items()):
+                    if requested and tab not in requested:
+                        continue
+                    sheet = {'properties': {'title': tab, 'sheetId': index, 'index': index}}
+                    if includeGridData:
+                        windows = requested.get(tab) or [(0, 0, None, None)]
+                        sheet['data'] = [self.backend._grid(tab_cells, *window) for window in windows]
+                    sheets.append(sheet)
+                return {
+                    'spreadsheetId': spreadsheetId,
+                    'properties': {'title': spreadsheet['name']},
+                    'sheets': sheets
+                }
+        return FakeRequest(self.backend, 'sheets.spreadsheets.get', run)
+
+class _Values:
+    def __init__(self, backend):
+        self.backend = backend
+    
+    def get(self, spreadsheetId, range, **kwargs):
+        def run():
+            with self.backend._lock:
+                spreadsheet = self.backend._get(spreadsheetId)
+                tab, start_row, start_col, end_row, end_col = self.backend._resolve_range(spreadsheet, range)
+                rows = [
+                    [self.backend._formatted(value) for value in row]
+                    for row in self.backend._window(spreadsheet['tabs'][tab], start_row, start_col, end_row, end_col)
+                ]
+                result = {'range': range, 'majorDimension': 'ROWS'}
+                if rows:
+                    result['values'] = rows
+                return result
+        return FakeRequest(self.backend, 'sheets.spreadsheets.values.get', run)
+    
+    def update(self, spreadsheetId, range, body=None, valueInputOption='RAW', **kwargs):
+        def run():
+            with self.backend._lock:
+                spreadsheet = self.backend._get(spreadsheetId)
+                tab, start_row, start_col, _, _ = self.backend._resolve_range(spreadsheet, range)
+                updated = 0
+                for row_offset, row in enumerate((body or {}).get('values', [])):
+                    for col_offset, value in enumerate(row):
+                        cell_ref = column_label(start_col + col_offset) + str(start_row + row_offset + 1)
+                        if valueInputOption == 'USER_ENTERED':
+                            value = self.backend._user_entered(value)
+                        spreadsheet['tabs'][tab][cell_ref] = value
+                        updated += 1
+                self.backend._touch(spreadsheet)
+                return {'spreadsheetId': spreadsheetId, 'updatedRange': range, 'updatedCells': updated}
+        return FakeRequest(self.backend, 'sheets.spreadsheets.values.update', run)
+
+class _DriveService:
+    def __init__(self, backend):
+        self.backend = backend
+    
+    def files(self):
+        return _Files(self.backend)
+    
+    def permissions(self):
+        return _Permissions(self.backend)
+    
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self.backend, callback)
+
+class _Files:
+    def __init__(self, backend):
+        self.backend = backend
+    
+    def _metadata(self, file_id: str, spreadsheet: dict) -> dict:
+        return {
+            'id': file_id,
+            'name': spreadsheet['name'],
+            'mimeType': 'application/vnd.google-apps.spreadsheet',
+            'version': str(spreadsheet['version']),
+            'modifiedTime': spreadsheet['modifiedTime'],
+            'createdTime': spreadsheet.get('createdTime', spreadsheet['modifiedTime']),
+            'webViewLink': f"https://docs.google.com/spreadsheets/d/{file_id}/edit"
+        }
+    
+    def copy(self, fileId, body=None, **kwargs):
+        def run():
+            with self.backend._lock:
+                source = self.backend._get(fileId)
+                new_id = self.backend.add_spreadsheet((body or {}).get('name') or f"Copy of {source['name']}")
+                self.backend._files[new_id]['tabs'] = copy.deepcopy(source['tabs'])
+                self.backend._save()
+                return {'id': new_id, 'name': self.backend._files[new_id]['name']}
+        return FakeRequest(self.backend, 'drive.files.copy', run)
+    
+    def get(self, fileId, fields=None, **kwargs):
+        def run():
+            with self.backend._lock:
+                return self._metadata(fileId, self.backend._get(fileId))
+        return FakeRequest(self.backend, 'drive.files.get', run)
+    
+    def list(self, q=None, pageSize=100, fields=None, **kwargs):
+        def run():
+            with self.backend._lock:
+                files = [self._metadata(file_id, spreadsheet) for file_id, spreadsheet in self.backend._files.items()]
+                return {'files': files[:pageSize]}
+        return FakeRequest(self.backend, 'drive.files.list', run)
+    
+    def update(self, fileId, body=None, **kwargs):
+        def run():
+            with self.backend._lock:
+                spreadsheet = self.backend._get(fileId)
+                if (body or {}).get('name'):
+                    spreadsheet['name'] = body['name']
+                self.backend._touch(spreadsheet)
+                return {'id': fileId, 'name': spreadsheet['name']}
+        return FakeRequest(self.backend, 'drive.files.update', run)
+    
+    def delete(self, fileId, **kwargs):
+        def run():
+            with self.backend._lock:
+                self.backend._get(fileId)
+                del self.backend._files[fileId]
+                self.backend._save()
+                return ''
+        return FakeRequest(self.backend, 'drive.files.delete', run)
+
+class _Permissions:
+    def __init__(self, backend):
+        self.backend = backend
+    
+    def create(self, fileId, body=None, **kwargs):
+        def run():
+            with self.backend._lock:
+                spreadsheet = self.backend._get(fileId)
+                permission = dict(body or {})
+                if permission.get('type') == 'user' and '@' not in permission.get('emailAddress', ''):
+                    raise _http_error(400, 'Invalid email address')
+                permission['id'] = str(len(spreadsheet['permissions']) + 1)
+                spreadsheet['permissions'].append(permission)
+                self.backend._save()
+                return {'id': permission['id'], 'type': permission.get('type'), 'role': permission.get('role')}
+        return FakeRequest(self.backend, 'drive.permissions.create', run)
+
+_configured_backend = None
+_configured_backend_lock = threading.Lock()
+
+def get_configured_backend():
+    """Backend selected by GOOGLE_SHEETS_BACKEND ('fake' or 'fake:<json path>'), else None"""
+    global _configured_backend
+    setting = os.environ.get('GOOGLE_SHEETS_BACKEND', '')
+    if not setting.startswith('fake'):
+        return None
+    with _configured_backend_lock:
+        if _configured_backend is None:
+            _, _, storage_path = setting.partition(':')
+            _configured_backend = FakeGoogleBackend(storage_path=storage_path or None)
+        return _configured_backend
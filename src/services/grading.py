@@ -1,10 +1,69 @@
 """Grading engine for auto-grading assessments"""
 
-from src.services.google_sheets import get_google_sheets_service
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from src.services.google_sheets import get_google_sheets_service, column_label, column_index
+
+# Question types graded from the candidate's sheet
+SHEET_GRADED_TYPES = ('formula', 'data-entry', 'mcq')
+
+# Range read for MCQ answers (the answer is expected in A1)
+MCQ_RANGE = 'A1:Z100'
+
+# Concurrent sheet fetches per grading run, and the wall-clock budget for each fetch (seconds)
+GRADING_MAX_WORKERS = int(os.environ.get('GRADING_MAX_WORKERS', 8))
+GRADING_FETCH_TIMEOUT = float(os.environ.get('GRADING_FETCH_TIMEOUT', 30))
+
+# Answer keys with more cells than this are fetched as one bounding range
+MAX_GRID_RANGES = int(os.environ.get('GRADING_MAX_GRID_RANGES', 50))
+
+CELL_REF_PATTERN = re.compile(r'^([A-Z]{1,3})([0-9]+)$')
+
+def answer_key_cells(question: dict):
+    """Cells the answer key of a sheet-graded question refers to, or None if unknown"""
+    answer_key = question.get('answer_key') or {}
+    if question.get('type') == 'formula':
+        cells = list((answer_key.get('formulas') or {}).keys()) + list((answer_key.get('values') or {}).keys())
+    elif question.get('type') == 'data-entry':
+        cells = list(answer_key.keys())
+    else:
+        return None
+    
+    cells = [str(cell).strip().upper() for cell in cells]
+    if not cells or not all(CELL_REF_PATTERN.match(cell) for cell in cells):
+        return None
+    return sorted(set(cells))
+
+def answer_key_ranges(cells):
+    """A1 ranges covering the given cells; None means fetch the whole sheet"""
+    if not cells:
+        return None
+    if len(cells) <= MAX_GRID_RANGES:
+        return list(cells)
+    
+    # Too many ranges for one request URL: fetch their bounding box instead
+    parsed = [CELL_REF_PATTERN.match(cell).groups() for cell in cells]
+    columns = [column_index(letters) for letters, _ in parsed]
+    rows = [int(row) for _, row in parsed]
+    return [f"{column_label(min(columns))}{min(rows)}:{column_label(max(columns))}{max(rows)}"]
+
+def question_to_dict(question) -> dict:
+    """Plain dict of the question fields grading needs"""
+    return {
+        'id': question.id,
+        'type': question.type,
+        'answer_key': question.answer_key or {},
+        'points': question.points if question.points is not None else 10
+    }
 
 class GradingEngine:
-    def __init__(self):
-        self.google_sheets = get_google_sheets_service()
+    def __init__(self, google_sheets=None, max_workers: int = GRADING_MAX_WORKERS,
+                 fetch_timeout: float = GRADING_FETCH_TIMEOUT):
+        self.google_sheets = google_sheets if google_sheets is not None else get_google_sheets_service()
+        self.max_workers = max(1, int(max_workers))
+        self.fetch_timeout = fetch_timeout
     
     def grade_response(self, question: dict, sheet_url: str) -> dict:
         """Grade a response based on question type"""
@@ -21,19 +80,154 @@ class GradingEngine:
         else:
             return {'auto_score': 0, 'error': 'Unknown question type'}
     
-    def grade_formula_question(self, question: dict, sheet_url: str) -> dict:
-        """Grade a formula question"""
-        answer_key = question.get('answer_key', {})
-        points = question.get('points', 10)
+    def grade_session(self, db, responses: list) -> dict:
+        """Grade all responses of a session from one fetch per distinct sheet
+        
+        Questions are loaded in a single query and each sheet is fetched
+        once, however many responses point at it. Responses without a
+        sheet URL are skipped. Returns {response_id: result}.
+        """
+        from src.database import Question
         
-        if not self.google_sheets:
+        gradable = [r for r in responses if r.sheet_url]
+        question_ids = {r.question_id for r in gradable}
+        questions = {
+            q.id: question_to_dict(q)
+            for q in db.query(Question).filter(Question.id.in_(question_ids)).all()
+        } if question_ids else {}
+        
+        # Work out which sheets (and cells) each response needs before fetching anything
+        grid_cells = {}
+        values_sheet_ids = set()
+        plan = []
+        for response in gradable:
+            question = questions.get(response.question_id)
+            if not question:
+                continue
+            sheet_id = None
+            if question['type'] in SHEET_GRADED_TYPES and self._sheets_configured():
+                sheet_id = self.google_sheets.extract_sheet_id(response.sheet_url)
+                if sheet_id and question['type'] == 'mcq':
+                    values_sheet_ids.add(sheet_id)
+                elif sheet_id:
+                    cells = answer_key_cells(question)
+                    if sheet_id not in grid_cells:
+                        grid_cells[sheet_id] = set()
+                    # None (whole sheet) wins over any cell list for the same sheet
+                    if cells is None or grid_cells[sheet_id] is None:
+                        grid_cells[sheet_id] = None
+                    else:
+                        grid_cells[sheet_id].update(cells)
+            plan.append((response, question, sheet_id))
+        
+        # Fetch every distinct sheet concurrently; results keep the plan's order
+        fetches = {}
+        for sheet_id in sorted(grid_cells):
+            ranges = answer_key_ranges(sorted(grid_cells[sheet_id]) if grid_cells[sheet_id] else None)
+            fetches[('grid', sheet_id)] = lambda sheet_id=sheet_id, ranges=ranges: self.google_sheets.get_sheet_with_formulas(sheet_id, ranges)
+        for sheet_id in sorted(values_sheet_ids):
+            fetches[('values', sheet_id)] = lambda sheet_id=sheet_id: self.google_sheets.get_sheet_values(sheet_id, MCQ_RANGE)
+        fetched = self._fetch_concurrently(fetches)
+        
+        results = {}
+        for response, question, sheet_id in plan:
+            kind = 'values' if question['type'] == 'mcq' else 'grid'
+            data, error = fetched.get((kind, sheet_id), (None, None))
+            if error:
+                results[response.id] = {'auto_score': 0, 'error': error}
+            elif kind == 'values':
+                results[response.id] = self._grade_from_snapshot(question, sheet_id, None, data)
+            else:
+                results[response.id] = self._grade_from_snapshot(question, sheet_id, data, None)
+        return results
+    
+    def _fetch_concurrently(self, fetches: dict) -> dict:
+        """Run {key: callable} on a bounded worker pool
+        
+        Each call gets fetch_timeout seconds from the moment a worker picks it
+        up. Returns {key: (value, error)} where error is a message if the call
+        raised or timed out.
+        """
+        if not fetches:
+            return {}
+        
+        started_at = {}
+        
+        def timed(key, fetch):
+            started_at[key] = time.monotonic()
+            return fetch()
+        
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(fetches)), thread_name_prefix='grading')
+        try:
+            futures = {key: executor.submit(timed, key, fetch) for key, fetch in fetches.items()}
+            for key, future in futures.items():
+                while True:
+                    start = started_at.get(key)
+                    wait = self.fetch_timeout if start is None else start + self.fetch_timeout - time.monotonic()
+                    try:
+                        results[key] = (future.result(timeout=max(0, wait)), None)
+                        break
+                    except FutureTimeoutError:
+                        # Still queued behind other fetches: keep waiting for it to start
+                        if started_at.get(key) is None:
+                            continue
+                        if time.monotonic() - started_at[key] < self.fetch_timeout:
+                            continue
+                        results[key] = (None, f"Timed out after {self.fetch_timeout:g}s fetching sheet data")
+                        break
+                    except Exception as e:
+                        results[key] = (None, f"Error fetching sheet data: {e}")
+                        break
+        finally:
+            # Don't block on fetches that timed out; their threads finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+    
+    def _grade_from_snapshot(self, question: dict, sheet_id, sheet_data, values) -> dict:
+        """Grade one response from already-fetched sheet data"""
+        question_type = question.get('type')
+        
+        if question_type == 'scenario':
+            return {'auto_score': None, 'manual_required': True}
+        if question_type not in SHEET_GRADED_TYPES:
+            return {'auto_score': 0, 'error': 'Unknown question type'}
+        if not self._sheets_configured():
             return {'auto_score': 0, 'error': 'Google Sheets API not configured'}
+        if not sheet_id:
+            return {'auto_score': 0, 'error': 'Invalid sheet URL'}
+        
+        if question_type == 'formula':
+            return self._grade_formula(question, sheet_data)
+        elif question_type == 'data-entry':
+            return self._grade_data_entry(question, sheet_data)
+        return self._grade_mcq(question, values)
+    
+    def _sheets_configured(self) -> bool:
+        return bool(self.google_sheets) and self.google_sheets.is_configured()
+    
+    def _resolve_sheet_id(self, sheet_url: str):
+        """Return (sheet_id, error_result) for a response sheet URL"""
+        if not self._sheets_configured():
+            return None, {'auto_score': 0, 'error': 'Google Sheets API not configured'}
         
         sheet_id = self.google_sheets.extract_sheet_id(sheet_url)
         if not sheet_id:
-            return {'auto_score': 0, 'error': 'Invalid sheet URL'}
+            return None, {'auto_score': 0, 'error': 'Invalid sheet URL'}
+        return sheet_id, None
+    
+    def grade_formula_question(self, question: dict, sheet_url: str) -> dict:
+        """Grade a formula question"""
+        sheet_id, error = self._resolve_sheet_id(sheet_url)
+        if error:
+            return error
+        ranges = answer_key_ranges(answer_key_cells(question))
+        return self._grade_formula(question, self.google_sheets.get_sheet_with_formulas(sheet_id, ranges))
+    
+    def _grade_formula(self, question: dict, sheet_data) -> dict:
+        answer_key = question.get('answer_key', {})
+        points = question.get('points', 10)
         
-        sheet_data = self.google_sheets.get_sheet_with_formulas(sheet_id)
         if not sheet_data:
             return {'auto_score': 0, 'error': 'Could not fetch sheet data'}
         
@@ -55,17 +249,16 @@ class GradingEngine:
     
     def grade_data_entry_question(self, question: dict, sheet_url: str) -> dict:
         """Grade a data entry question"""
+        sheet_id, error = self._resolve_sheet_id(sheet_url)
+        if error:
+            return error
+        ranges = answer_key_ranges(answer_key_cells(question))
+        return self._grade_data_entry(question, self.google_sheets.get_sheet_with_formulas(sheet_id, ranges))
+    
+    def _grade_data_entry(self, question: dict, sheet_data) -> dict:
         answer_key = question.get('answer_key', {})
         points = question.get('points', 10)
         
-        if not self.google_sheets:
-            return {'auto_score': 0, 'error': 'Google Sheets API not configured'}
-        
-        sheet_id = self.google_sheets.extract_sheet_id(sheet_url)
-        if not sheet_id:
-            return {'auto_score': 0, 'error': 'Invalid sheet URL'}
-        
-        sheet_data = self.google_sheets.get_sheet_with_formulas(sheet_id)
         if not sheet_data:
             return {'auto_score': 0, 'error': 'Could not fetch sheet data'}
         
@@ -79,20 +272,17 @@ class GradingEngine:
     
     def grade_mcq_question(self, question: dict, sheet_url: str) -> dict:
         """Grade an MCQ question"""
+        sheet_id, error = self._resolve_sheet_id(sheet_url)
+        if error:
+            return error
+        return self._grade_mcq(question, self.google_sheets.get_sheet_values(sheet_id, MCQ_RANGE))
+    
+    def _grade_mcq(self, question: dict, values) -> dict:
         answer_key = question.get('answer_key', {})
         points = question.get('points', 10)
         
         correct_answer = answer_key.get('answer', '').strip().upper()
         
-        if not self.google_sheets:
-            return {'auto_score': 0, 'error': 'Google Sheets API not configured'}
-        
-        sheet_id = self.google_sheets.extract_sheet_id(sheet_url)
-        if not sheet_id:
-            return {'auto_score': 0, 'error': 'Invalid sheet URL'}
-        
-        values = self.google_sheets.get_sheet_values(sheet_id, 'A1:Z100')
-        
         if values and len(values) > 0:
             user_answer = str(values[0][0]).strip().upper() if len(values[0]) > 0 else ''
             if user_answer == correct_answer:
@@ -135,7 +325,8 @@ class GradingEngine:
             actual_cell = sheet_data.get(cell_ref)
             
             if actual_cell:
-                actual_value = actual_cell.get('value')
+                # Formula cells are compared on their computed result
+                actual_value = actual_cell.get('effective_value', actual_cell.get('value'))
                 
                 # Compare as numbers if both are numeric
                 try:
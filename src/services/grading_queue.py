@@ -0,0 +1,214 @@
+"""
+Durable grading queue
+
+Submitting an assessment only records a GradingJob row; a worker thread
+(started once per Streamlit process) or a standalone worker process picks
+jobs up, grades the session and writes Response.auto_score and
+Session.final_score in the same transaction that marks the job done, so a
+crash mid-grade never leaves a session half-scored.
+
+Run a standalone worker with:
+    python -m src.services.grading_queue
+"""
+
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta
+from src.database import SessionLocal, GradingJob, Session, Response
+
+# Attempts before a job is marked failed, and the base of the exponential retry delay (seconds)
+MAX_ATTEMPTS = int(os.environ.get('GRADING_MAX_ATTEMPTS', 5))
+RETRY_BASE_DELAY = float(os.environ.get('GRADING_RETRY_DELAY', 10))
+
+# A running job whose worker has not finished within this time is picked up again
+LOCK_TIMEOUT = timedelta(seconds=int(os.environ.get('GRADING_LOCK_TIMEOUT', 600)))
+
+# Idle worker poll interval (seconds)
+POLL_INTERVAL = float(os.environ.get('GRADING_POLL_INTERVAL', 1.0))
+
+# Per-response grading errors that retrying cannot fix
+PERMANENT_ERRORS = {'Invalid sheet URL', 'Unknown question type', 'Google Sheets API not configured'}
+
+def enqueue_grading(db, session_id: int):
+    """Queue a session for grading; the caller commits
+    
+    Re-enqueueing a session resets its existing job, so a job row per
+    session is all that is ever kept.
+    """
+    job = db.query(GradingJob).filter(GradingJob.session_id == session_id).first()
+    now = datetime.utcnow()
+    if not job:
+        job = GradingJob(session_id=session_id, status='queued', attempts=0, available_at=now)
+        db.add(job)
+    else:
+        job.status = 'queued'
+        job.attempts = 0
+        job.last_error = None
+        job.available_at = now
+        job.locked_at = None
+    
+    _wake_event.set()
+    return job
+
+def get_grading_status(db, session_id: int):
+    """Status of a session's grading job, or None if it was never queued"""
+    job = db.query(GradingJob.status).filter(GradingJob.session_id == session_id).first()
+    return job[0] if job else None
+
+def _due_filter(now):
+    """Queued jobs past their backoff, plus running jobs whose worker went away"""
+    return (
+        ((GradingJob.status == 'queued') & (GradingJob.available_at <= now)) |
+        ((GradingJob.status == 'running') & (GradingJob.locked_at < now - LOCK_TIMEOUT))
+    )
+
+def claim_next_job(db):
+    """Atomically claim the next due job; returns (job_id, session_id, attempts) or None"""
+    now = datetime.utcnow()
+    candidates = db.query(GradingJob.id, GradingJob.status, GradingJob.attempts).filter(
+        _due_filter(now)
+    ).order_by(GradingJob.available_at, GradingJob.id).limit(5).all()
+    
+    for job_id, status, attempts in candidates:
+        # Compare-and-swap: only one worker can move the job out of the state it saw
+        claimed = db.query(GradingJob).filter(
+            GradingJob.id == job_id,
+            GradingJob.status == status,
+            GradingJob.attempts == attempts
+        ).update({
+            GradingJob.status: 'running',
+            GradingJob.attempts: attempts + 1,
+            GradingJob.locked_at: now,
+            GradingJob.updated_at: now
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            session_id = db.query(GradingJob.session_id).filter(GradingJob.id == job_id).scalar()
+            return job_id, session_id, attempts + 1
+    return None
+
+def process_job(job_id: int, session_id: int, attempt: int, grading_engine) -> bool:
+    """Grade one claimed job; returns True when the job is done"""
+    db = SessionLocal()
+    try:
+        session = db.get(Session, session_id)
+        if not session:
+            _finish(db, job_id, 'failed', 'Session not found')
+            return False
+        
+        responses = db.query(Response).filter(Response.session_id == session_id).all()
+        results = grading_engine.grade_session(db, responses)
+        
+        # Transient fetch problems (quota, timeouts) are retried instead of scoring 0
+        transient = [result['error'] for result in results.values()
+                     if result.get('error') and result['error'] not in PERMANENT_ERRORS]
+        if transient and attempt < MAX_ATTEMPTS:
+            db.rollback()
+            _retry(db, job_id, attempt, transient[0])
+            return False
+        
+        total_score = 0
+        for response in responses:
+            result = results.get(response.id)
+            if result is not None:
+                response.auto_score = result.get('auto_score', 0)
+            # Manual review scores take precedence, as on the Sessions page
+            total_score += response.manual_score if response.manual_score else (response.auto_score or 0)
+        session.final_score = total_score
+        
+        # Scores and job completion commit together, so re-running a job is harmless
+        _finish(db, job_id, 'done', '; '.join(transient) or None)
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Grading job {job_id} failed: {e}")
+        traceback.print_exc()
+        if attempt < MAX_ATTEMPTS:
+            _retry(db, job_id, attempt, str(e))
+        else:
+            _finish(db, job_id, 'failed', str(e))
+        return False
+    finally:
+        db.close()
+
+def _finish(db, job_id, status, error):
+    job = db.get(GradingJob, job_id)
+    job.status = status
+    job.last_error = error
+    job.locked_at = None
+    db.commit()
+
+def _retry(db, job_id, attempt, error):
+    job = db.get(GradingJob, job_id)
+    job.status = 'queued'
+    job.last_error = error
+    job.locked_at = None
+    job.available_at = datetime.utcnow() + timedelta(seconds=RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    db.commit()
+
+def run_pending_jobs(grading_engine, max_jobs: int = None) -> int:
+    """Process due jobs until the queue is empty (or max_jobs); returns jobs handled"""
+    handled = 0
+    while max_jobs is None or handled < max_jobs:
+        db = SessionLocal()
+        try:
+            claimed = claim_next_job(db)
+        finally:
+            db.close()
+        if not claimed:
+            break
+        process_job(*claimed, grading_engine)
+        handled += 1
+    return handled
+
+def _build_worker_engine():
+    """Grading engine for a worker, which has no Streamlit session to read credentials from"""
+    from src.services.google_sheets import GoogleSheetsAPI, get_shared_client, load_google_credentials
+    from src.services.grading import GradingEngine
+    return GradingEngine(google_sheets=get_shared_client(load_google_credentials()) or GoogleSheetsAPI())
+
+def has_due_jobs() -> bool:
+    """Cheap check for claimable jobs"""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        return db.query(GradingJob.id).filter(_due_filter(now)).first() is not None
+    finally:
+        db.close()
+
+def worker_loop(stop_event=None, engine_factory=_build_worker_engine):
+    """Poll for jobs forever (or until stop_event is set)"""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        handled = 0
+        try:
+            # A fresh engine per batch picks up credentials uploaded since the last one
+            if has_due_jobs():
+                handled = run_pending_jobs(engine_factory())
+        except Exception as e:
+            print(f"⚠️ Grading worker error: {e}")
+            handled = 0
+        if not handled:
+            _wake_event.wait(POLL_INTERVAL)
+            _wake_event.clear()
+
+# Set when a job is enqueued so an idle in-process worker reacts immediately
+_wake_event = threading.Event()
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+def start_grading_worker():
+    """Start the in-process worker thread once; safe to call on every rerun"""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=worker_loop, name='grading-worker', daemon=True)
+            _worker_thread.start()
+    return _worker_thread
+
+if __name__ == "__main__":
+    from src.database import init_db
+    init_db()
+    print("✅ Grading worker started")
+    worker_loop()
@@ -0,0 +1,299 @@
+"""
+Warm pool of pre-copied template sheets
+
+Copying a template and sharing the copy takes several Drive round trips,
+which candidates used to wait for on the first click of every question.
+A background task keeps SHEET_POOL_SIZE ready copies of each template used
+by an open invitation; "Create Your Copy" then only renames a ready copy
+and grants the candidate edit access.
+
+Copies are tagged with the template's Drive modifiedTime/version. When the
+template changes, its ready copies go stale and are deleted from Drive on
+the next pass instead of being handed out.
+"""
+
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import insert
+from src.database import SessionLocal, SheetPoolEntry, Question, Invitation, Response
+
+# Ready copies kept per template (0, the default, disables the pool) and seconds between replenish passes
+SHEET_POOL_SIZE = int(os.environ.get('SHEET_POOL_SIZE', 0))
+SHEET_POOL_INTERVAL = float(os.environ.get('SHEET_POOL_INTERVAL', 60))
+
+# Seconds a template's Drive revision is reused by claims before it is fetched again
+TEMPLATE_REVISION_TTL = float(os.environ.get('SHEET_POOL_REVISION_TTL', SHEET_POOL_INTERVAL))
+
+# Question types the candidate page gives a personal sheet copy
+POOLED_TYPES = ('formula', 'data-entry', 'scenario')
+
+# Default for assessments without a 'provision_sheets_at_start' setting, and copies made at once
+PROVISION_SHEETS_AT_START = os.environ.get('PROVISION_SHEETS_AT_START', '').lower() in ('1', 'true', 'yes')
+PROVISION_MAX_WORKERS = int(os.environ.get('PROVISION_MAX_WORKERS', 4))
+
+def active_template_ids(db, google_sheets) -> set:
+    """Template sheet IDs of questions in assessments with open invitations"""
+    rows = db.query(Question.sheet_template_url).join(
+        Invitation, Invitation.assessment_id == Question.assessment_id
+    ).filter(
+        Invitation.status.in_(('sent', 'started')),
+        Invitation.expires_at > datetime.utcnow(),
+        Question.type.in_(POOLED_TYPES),
+        Question.sheet_template_url.isnot(None)
+    ).distinct().all()
+    
+    template_ids = set()
+    for (url,) in rows:
+        sheet_id = google_sheets.extract_sheet_id(url) if url else None
+        if sheet_id:
+            template_ids.add(sheet_id)
+    return template_ids
+
+# template_id -> (revision, monotonic time it was fetched); refreshed by every replenish pass
+_revisions = {}
+_revisions_lock = threading.Lock()
+
+def template_revision(google_sheets, template_id: str, max_age: float = 0):
+    """Drive revision of a template, reusing one fetched within max_age seconds"""
+    now = time.monotonic()
+    with _revisions_lock:
+        cached = _revisions.get(template_id)
+    if cached and now - cached[1] < max_age:
+        return cached[0]
+    revision = google_sheets.get_sheet_revision(template_id)
+    if revision:
+        with _revisions_lock:
+            _revisions[template_id] = (revision, now)
+    return revision
+
+def invalidate_template(db, template_id: str, revision: str) -> int:
+    """Mark ready copies made from another revision of the template as stale"""
+    stale = db.query(SheetPoolEntry).filter(
+        SheetPoolEntry.template_sheet_id == template_id,
+        SheetPoolEntry.status == 'ready',
+        SheetPoolEntry.template_revision != revision
+    ).update({SheetPoolEntry.status: 'stale'}, synchronize_session=False)
+    db.commit()
+    return stale
+
+def replenish_template(db, google_sheets, template_id: str) -> int:
+    """Top up one template's ready copies; returns copies created"""
+    revision = template_revision(google_sheets, template_id)
+    if not revision:
+        return 0
+    invalidate_template(db, template_id, revision)
+    
+    ready = db.query(SheetPoolEntry).filter(
+        SheetPoolEntry.template_sheet_id == template_id,
+        SheetPoolEntry.status == 'ready'
+    ).count()
+    missing = SHEET_POOL_SIZE - ready
+    if missing <= 0:
+        return 0
+    
+    # Copies are renamed when assigned; the pool name only identifies strays in Drive
+    items = [
+        {'key': idx, 'source_sheet_id': template_id, 'title': f"Pool copy of {template_id}"}
+        for idx in range(missing)
+    ]
+    result = google_sheets.provision_sheets(items)
+    created = 0
+    for item_result in result.get('items', {}).values():
+        if item_result.get('success'):
+            db.add(SheetPoolEntry(
+                template_sheet_id=template_id,
+                template_revision=revision,
+                sheet_id=item_result['sheet_id'],
+                status='ready'
+            ))
+            created += 1
+        else:
+            print(f"⚠️ Could not pre-copy template {template_id}: {item_result.get('error')}")
+    db.commit()
+    return created
+
+def purge_stale(db, google_sheets) -> int:
+    """Delete stale copies from Drive and drop their rows"""
+    entries = db.query(SheetPoolEntry).filter(SheetPoolEntry.status == 'stale').all()
+    purged = 0
+    for entry in entries:
+        if google_sheets.delete_sheet(entry.sheet_id):
+            db.delete(entry)
+            purged += 1
+    db.commit()
+    return purged
+
+def replenish_pool(google_sheets) -> int:
+    """One replenish pass over every active template; returns copies created"""
+    if SHEET_POOL_SIZE <= 0 or not google_sheets or not google_sheets.is_configured():
+        return 0
+    
+    db = SessionLocal()
+    try:
+        created = 0
+        for template_id in sorted(active_template_ids(db, google_sheets)):
+            try:
+                created += replenish_template(db, google_sheets, template_id)
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Sheet pool replenish failed for {template_id}: {e}")
+        purge_stale(db, google_sheets)
+        return created
+    finally:
+        db.close()
+
+def claim_pooled_sheet(db, google_sheets, template_id: str, title: str, share_with_email: str = None):
+    """Hand a ready copy of the template to a candidate
+    
+    Returns a copy_sheet()-style result, or None when no up-to-date copy
+    is available and the caller should copy the template itself.
+    
+    The template revision is reused for TEMPLATE_REVISION_TTL seconds (the
+    replenisher refreshes it and marks older copies stale), so a claim
+    normally costs only the rename-and-share batch. A template edited
+    within that window can still hand out a copy of the previous revision.
+    """
+    if SHEET_POOL_SIZE <= 0 or not google_sheets or not google_sheets.is_configured():
+        return None
+    
+    revision = template_revision(google_sheets, template_id, max_age=TEMPLATE_REVISION_TTL)
+    if not revision:
+        return None
+    
+    candidates = db.query(SheetPoolEntry.id, SheetPoolEntry.sheet_id).filter(
+        SheetPoolEntry.template_sheet_id == template_id,
+        SheetPoolEntry.status == 'ready',
+        SheetPoolEntry.template_revision == revision
+    ).order_by(SheetPoolEntry.created_at, SheetPoolEntry.id).limit(5).all()
+    
+    for entry_id, sheet_id in candidates:
+        # Compare-and-swap so two candidates never get the same copy
+        claimed = db.query(SheetPoolEntry).filter(
+            SheetPoolEntry.id == entry_id,
+            SheetPoolEntry.status == 'ready'
+        ).update({
+            SheetPoolEntry.status: 'assigned',
+            SheetPoolEntry.assigned_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        if not claimed:
+            continue
+        
+        _wake_event.set()
+        result = google_sheets.assign_sheet(sheet_id, title, share_with_email)
+        if result.get('success'):
+            return result
+        
+        # Half-assigned copy: let the replenisher delete it and fall back to a fresh copy
+        print(f"⚠️ Could not assign pooled sheet {sheet_id}: {result.get('error')}")
+        db.query(SheetPoolEntry).filter(SheetPoolEntry.id == entry_id).update(
+            {SheetPoolEntry.status: 'stale'}, synchronize_session=False
+        )
+        db.commit()
+        return None
+    return None
+
+def provisioning_enabled(assessment) -> bool:
+    """Whether sheets are created for every question when a session starts"""
+    settings = assessment.settings or {}
+    return bool(settings.get('provision_sheets_at_start', PROVISION_SHEETS_AT_START))
+
+def provision_session_sheets(db, google_sheets, session, assessment, questions) -> dict:
+    """Create the sheet copy of every sheet question for a new session
+    
+    Copies (pooled when available) are made concurrently on at most
+    PROVISION_MAX_WORKERS threads, then all Response rows are inserted
+    in one statement; the caller commits. Returns {question_id: error}
+    for questions the candidate still has to copy by hand.
+    """
+    if not google_sheets or not google_sheets.is_configured():
+        return {}
+    
+    existing = {
+        question_id for (question_id,) in db.query(Response.question_id).filter(
+            Response.session_id == session.id
+        ).all()
+    }
+    targets = []
+    for idx, question in enumerate(questions):
+        if question.type not in POOLED_TYPES or not question.sheet_template_url or question.id in existing:
+            continue
+        template_id = google_sheets.extract_sheet_id(question.sheet_template_url)
+        if template_id:
+            title = f"{assessment.title} - Q{idx + 1} - {session.candidate_email}"
+            targets.append((question.id, template_id, title))
+    if not targets:
+        return {}
+    
+    def provision(target):
+        question_id, template_id, title = target
+        # Pool claims commit their own compare-and-swap, so each thread needs its own session
+        worker_db = SessionLocal()
+        try:
+            result = claim_pooled_sheet(worker_db, google_sheets, template_id, title, session.candidate_email)
+        except Exception as e:
+            worker_db.rollback()
+            result = None
+        finally:
+            worker_db.close()
+        if not result:
+            # Timeouts and auth errors outlive the retries; one failure must not lose the other copies
+            try:
+                result = google_sheets.copy_sheet(template_id, title, session.candidate_email)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+        return question_id, result
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(PROVISION_MAX_WORKERS, len(targets))),
+                            thread_name_prefix='provision') as executor:
+        results = list(executor.map(provision, targets))
+    
+    rows = []
+    errors = {}
+    now = datetime.utcnow()
+    for question_id, result in results:
+        if result.get('success'):
+            rows.append({'session_id': session.id, 'question_id': question_id,
+                         'sheet_url': result['url'], 'created_at': now})
+        else:
+            errors[question_id] = result.get('error')
+    if rows:
+        db.execute(insert(Response), rows)
+    return errors
+
+def _build_pool_client():
+    """Sheets client for the pool worker, which has no Streamlit session"""
+    from src.services.google_sheets import get_shared_client, load_google_credentials
+    return get_shared_client(load_google_credentials())
+
+def pool_loop(stop_event=None, client_factory=_build_pool_client):
+    """Replenish every SHEET_POOL_INTERVAL seconds, or sooner after a claim"""
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        try:
+            replenish_pool(client_factory())
+        except Exception as e:
+            print(f"⚠️ Sheet pool worker error: {e}")
+            traceback.print_exc()
+        _wake_event.wait(SHEET_POOL_INTERVAL)
+        _wake_event.clear()
+
+# Set when a copy is claimed or invalidated so the worker refills promptly
+_wake_event = threading.Event()
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+def start_sheet_pool_worker():
+    """Start the replenisher thread once; a no-op when the pool is disabled"""
+    global _worker_thread
+    if SHEET_POOL_SIZE <= 0:
+        return None
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=pool_loop, name='sheet-pool', daemon=True)
+            _worker_thread.start()
+    return _worker_thread
@@ -0,0 +1,169 @@
+"""Aggregated statistics for dashboards"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import func, case
+from src.database import Recruiter, Assessment, AssessmentCounter
+
+@dataclass
+class AssessmentStats:
+    """Per-assessment row of the recruiter dashboard"""
+    id: int
+    title: str
+    description: Optional[str]
+    created_at: Optional[datetime]
+    question_count: int = 0
+    candidate_count: int = 0
+    completed_count: int = 0
+    
+    @property
+    def status(self) -> str:
+        # Simplified - can be enhanced
+        return "Draft" if self.question_count == 0 else "Active"
+
+@dataclass
+class DashboardStats:
+    """All tiles and the recent assessments table for one recruiter"""
+    total_assessments: int = 0
+    total_candidates: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    pending_reviews: int = 0
+    recent_assessments: List[AssessmentStats] = field(default_factory=list)
+
+@dataclass
+class SystemStats:
+    """System-wide totals for the admin panel"""
+    total_users: int = 0
+    active_users: int = 0
+    admin_users: int = 0
+    total_assessments: int = 0
+    total_sessions: int = 0
+    
+    @property
+    def recruiter_users(self) -> int:
+        return self.total_users - self.admin_users
+
+# Sort keys accepted by search_recruiters(), mapped to ORDER BY clauses
+RECRUITER_SORTS = {
+    'newest': (Recruiter.created_at.desc(), Recruiter.id.desc()),
+    'oldest': (Recruiter.created_at.asc(), Recruiter.id.asc()),
+    'name': (func.lower(Recruiter.name).asc(), Recruiter.id.asc()),
+    'last_login': (Recruiter.last_login.desc().nulls_last(), Recruiter.id.desc()),
+}
+
+def _per_assessment_query(db, recruiter_id: int):
+    """Assessments of a recruiter with their materialized counters"""
+    counters = AssessmentCounter
+    return db.query(
+        Assessment.id,
+        Assessment.title,
+        Assessment.description,
+        Assessment.created_at,
+        func.coalesce(counters.question_count, 0).label('question_count'),
+        func.coalesce(counters.invitation_count, 0).label('candidate_count'),
+        func.coalesce(counters.in_progress_count, 0).label('in_progress_count'),
+        func.coalesce(counters.completed_count, 0).label('completed_count'),
+        func.coalesce(counters.pending_review_count, 0).label('pending_review_count')
+    ).outerjoin(counters, counters.assessment_id == Assessment.id
+    ).filter(Assessment.recruiter_id == recruiter_id)
+
+def get_dashboard_stats(db, recruiter_id: int, recent_limit: int = 10) -> DashboardStats:
+    """Compute every dashboard tile and the recent assessments table in two queries"""
+    per_assessment = _per_assessment_query(db, recruiter_id).subquery()
+    
+    totals = db.query(
+        func.count(per_assessment.c.id),
+        func.coalesce(func.sum(per_assessment.c.candidate_count), 0),
+        func.coalesce(func.sum(per_assessment.c.in_progress_count), 0),
+        func.coalesce(func.sum(per_assessment.c.completed_count), 0),
+        func.coalesce(func.sum(per_assessment.c.pending_review_count), 0)
+    ).one()
+    
+    recent_rows = _per_assessment_query(db, recruiter_id).order_by(
+        Assessment.created_at.desc()
+    ).limit(recent_limit).all()
+    
+    return DashboardStats(
+        total_assessments=totals[0],
+        total_candidates=totals[1],
+        in_progress=totals[2],
+        completed=totals[3],
+        pending_reviews=totals[4],
+        recent_assessments=[
+            AssessmentStats(
+                id=row.id,
+                title=row.title,
+                description=row.description,
+                created_at=row.created_at,
+                question_count=row.question_count,
+                candidate_count=row.candidate_count,
+                completed_count=row.completed_count
+            )
+            for row in recent_rows
+        ]
+    )
+
+def get_system_stats(db) -> SystemStats:
+    """Compute the admin panel totals with conditional aggregation (two queries)"""
+    users = db.query(
+        func.count(Recruiter.id),
+        func.coalesce(func.sum(case((Recruiter.status == 'active', 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Recruiter.is_admin == True, 1), else_=0)), 0)
+    ).one()
+    
+    content = db.query(
+        func.count(Assessment.id),
+        func.coalesce(func.sum(AssessmentCounter.session_count), 0)
+    ).outerjoin(AssessmentCounter, AssessmentCounter.assessment_id == Assessment.id).one()
+    
+    return SystemStats(
+        total_users=users[0],
+        active_users=users[1],
+        admin_users=users[2],
+        total_assessments=content[0],
+        total_sessions=content[1]
+    )
+
+def search_recruiters(db, search: str = '', status: Optional[str] = None,
+                      is_admin: Optional[bool] = None, sort: str = 'newest'):
+    """Query recruiters with filtering and sorting done in SQL"""
+    query = db.query(Recruiter)
+    
+    if search:
+        query = query.filter(
+            Recruiter.name.icontains(search, autoescape=True) |
+            Recruiter.email.icontains(search, autoescape=True) |
+            Recruiter.company.icontains(search, autoescape=True)
+        )
+    if status:
+        query = query.filter(Recruiter.status == status)
+    if is_admin is not None:
+        query = query.filter(Recruiter.is_admin == is_admin)
+    
+    return query.order_by(*RECRUITER_SORTS.get(sort, RECRUITER_SORTS['newest']))
+
+def get_recruiter_overview(db):
+    """Rows of (recruiter columns, assessment count, session count) in one grouped query"""
+    per_recruiter = db.query(
+        Assessment.recruiter_id.label('recruiter_id'),
+        func.count(Assessment.id).label('assessment_count'),
+        func.coalesce(func.sum(AssessmentCounter.session_count), 0).label('session_count')
+    ).outerjoin(AssessmentCounter, AssessmentCounter.assessment_id == Assessment.id
+    ).group_by(Assessment.recruiter_id).subquery()
+    
+    return db.query(
+        Recruiter.id,
+        Recruiter.name,
+        Recruiter.email,
+        Recruiter.company,
+        Recruiter.dashboard_slug,
+        Recruiter.status,
+        func.coalesce(per_recruiter.c.assessment_count, 0).label('assessment_count'),
+        func.coalesce(per_recruiter.c.session_count, 0).label('session_count'),
+        Recruiter.created_at,
+        Recruiter.last_login,
+        Recruiter.is_admin
+    ).outerjoin(per_recruiter, per_recruiter.c.recruiter_id == Recruiter.id
+    ).order_by(*RECRUITER_SORTS['newest']).all()
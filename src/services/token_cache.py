@@ -0,0 +1,80 @@
+"""
+Candidate link token resolution cache
+
+Every candidate rerun resolved its ?token= by looking up the invitation
+and then the session on the unique token. What a token resolves to only
+changes on a few status transitions, all made by the candidate page
+itself: the session is created (started), the assessment is submitted
+(completed). Those call invalidate_token(); expiry is a timestamp and is
+checked against the cached expires_at.
+
+Steady-state reruns therefore resolve their identity without a query and
+only load the session row, which does change. TOKEN_CACHE_TTL bounds how
+long an entry is trusted in case another process changes an invitation.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from src.database import Invitation, Session
+
+# Tokens kept (least recently used are dropped first) and seconds an entry is trusted
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 5000))
+TOKEN_CACHE_TTL = float(os.environ.get('TOKEN_CACHE_TTL', 300))
+
+class ResolvedToken:
+    """What a candidate token points at"""
+    __slots__ = ('token', 'invitation_id', 'session_id', 'assessment_id', 'status', 'expires_at')
+    
+    def __init__(self, token, invitation_id, session_id, assessment_id, status, expires_at):
+        self.token = token
+        self.invitation_id = invitation_id
+        self.session_id = session_id
+        self.assessment_id = assessment_id
+        self.status = status
+        self.expires_at = expires_at
+
+def lookup_token(db, token: str):
+    """Resolve a token from the database; None for unknown tokens"""
+    row = db.query(
+        Invitation.id, Invitation.assessment_id, Invitation.status, Invitation.expires_at, Session.id
+    ).outerjoin(
+        Session, Session.unique_token == Invitation.unique_token
+    ).filter(Invitation.unique_token == token).first()
+    if not row:
+        return None
+    invitation_id, assessment_id, status, expires_at, session_id = row
+    return ResolvedToken(token, invitation_id, session_id, assessment_id, status, expires_at)
+
+# token -> (ResolvedToken, monotonic time it was resolved)
+_tokens = OrderedDict()
+_tokens_lock = threading.Lock()
+
+def resolve_token(db, token: str):
+    """Cached resolution of a candidate token; unknown tokens are not cached"""
+    now = time.monotonic()
+    with _tokens_lock:
+        cached = _tokens.get(token)
+        if cached and now - cached[1] < TOKEN_CACHE_TTL:
+            _tokens.move_to_end(token)
+            return cached[0]
+    
+    resolved = lookup_token(db, token)
+    with _tokens_lock:
+        if resolved:
+            _tokens[token] = (resolved, now)
+            _tokens.move_to_end(token)
+            while len(_tokens) > TOKEN_CACHE_SIZE:
+                _tokens.popitem(last=False)
+        else:
+            _tokens.pop(token, None)
+    return resolved
+
+def invalidate_token(token: str = None):
+    """Forget one token after its invitation or session changes status, or all of them"""
+    with _tokens_lock:
+        if token is None:
+            _tokens.clear()
+        else:
+            _tokens.pop(token, None)